@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Static asset budget report for public/
+Measures raw, gzip and (with the brotli package) brotli size of every file,
+groups them by type, flags files over budget and compares with a baseline
+
+    python3 asset_budget.py --format json --output asset-baseline.json
+    python3 asset_budget.py --baseline asset-baseline.json
+
+Budgets apply to transfer bytes: the smallest of the raw, gzip and brotli
+sizes, since servers skip compression when it does not help. Brotli is an
+optional dependency (pip install brotli); when it is missing on either side
+of a baseline comparison, both sides are compared on gzip alone.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from validate_pwa import format_bytes
+
+try:
+    import brotli
+except ImportError:
+    # Brotli sizes are reported only when the package is installed
+    brotli = None
+
+TYPE_GROUPS = {
+    'image': {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico', '.bmp'},
+    'script': {'.js', '.mjs', '.cjs'},
+    'style': {'.css'},
+    'font': {'.woff', '.woff2', '.ttf', '.otf', '.eot'},
+    'document': {'.html', '.json', '.xml', '.txt', '.webmanifest', '.map'},
+}
+
+# Per-file transfer budgets in bytes; a type may also set a 'total'
+DEFAULT_BUDGETS = {
+    'image': {'file': 200 * 1024},
+    'script': {'file': 150 * 1024},
+    'style': {'file': 50 * 1024},
+    'font': {'file': 100 * 1024},
+    'document': {'file': 50 * 1024},
+    'other': {'file': 500 * 1024},
+}
+
+
+def asset_type(path):
+    extension = os.path.splitext(path)[1].lower()
+    for group, extensions in TYPE_GROUPS.items():
+        if extension in extensions:
+            return group
+    return 'other'
+
+
+def measure_file(path, root):
+    """Raw, gzip and brotli sizes plus a content hash for one file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    gzip_size = len(gzip.compress(data, 9, mtime=0))
+    brotli_size = len(brotli.compress(data, quality=11)) if brotli is not None else None
+    sizes = [len(data), gzip_size] + ([brotli_size] if brotli_size is not None else [])
+
+    return {
+        'path': os.path.relpath(path, root).replace(os.sep, '/'),
+        'type': asset_type(path),
+        'raw': len(data),
+        'gzip': gzip_size,
+        'brotli': brotli_size,
+        'transfer': min(sizes),
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+
+
+def scan_assets(root='public', jobs=8):
+    """Measure every file under `root` with at most `jobs` threads (0 = one per core), sorted by path"""
+    paths = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        # Skip the temp files of atomic writes still in flight
+        paths.extend(os.path.join(directory, name) for name in sorted(files)
+                     if not name.endswith('.tmp'))
+
+    # zlib and brotli release the GIL, so threads compress in parallel
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        assets = list(pool.map(lambda path: measure_file(path, root), paths))
+    return sorted(assets, key=lambda asset: asset['path'])
+
+
+def summarize(assets):
+    """Per-type file counts and byte totals"""
+    totals = {}
+    for asset in assets:
+        total = totals.setdefault(asset['type'], {'files': 0, 'raw': 0, 'gzip': 0,
+                                                  'brotli': 0 if brotli else None,
+                                                  'transfer': 0})
+        total['files'] += 1
+        for key in ('raw', 'gzip', 'transfer'):
+            total[key] += asset[key]
+        if asset['brotli'] is not None:
+            total['brotli'] += asset['brotli']
+    return dict(sorted(totals.items()))
+
+
+def check_budgets(assets, totals, budgets):
+    """Messages for every file or type total over its transfer budget"""
+    problems = []
+    for asset in assets:
+        limit = budgets.get(asset['type'], {}).get('file')
+        if limit is not None and asset['transfer'] > limit:
+            problems.append(f"{asset['path']}: {_format_bytes(asset['transfer'])} over the "
+                            f"{_format_bytes(limit)} {asset['type']} budget")
+    for group, total in totals.items():
+        limit = budgets.get(group, {}).get('total')
+        if limit is not None and total['transfer'] > limit:
+            problems.append(f"{group} total: {_format_bytes(total['transfer'])} over the "
+                            f"{_format_bytes(limit)} budget")
+    return problems
+
+
+def _transfer(asset, use_brotli):
+    sizes = [asset['raw'], asset['gzip']]
+    if use_brotli and asset.get('brotli') is not None:
+        sizes.append(asset['brotli'])
+    return min(sizes)
+
+
+def compare(assets, baseline, threshold=1.10, floor=1024):
+    """Files and type totals that grew past `threshold` and `floor`, and new files
+
+    Returns (regressions, new_files, codecs). Brotli sizes only count when
+    both this run and the baseline have them; otherwise both sides are
+    compared on gzip, so a missing package does not show up as growth.
+    """
+    use_brotli = brotli is not None and bool(baseline.get('brotli'))
+    codecs = 'raw/gzip/brotli' if use_brotli else 'raw/gzip'
+    previous = {asset['path']: asset for asset in baseline.get('assets', [])}
+    regressions = []
+    new_files = []
+
+    def grew(old, new):
+        return new > old * threshold and new - old > floor
+
+    for asset in assets:
+        old = previous.get(asset['path'])
+        new = _transfer(asset, use_brotli)
+        if old is None:
+            new_files.append(f"{asset['path']}: {_format_bytes(new)}")
+        elif grew(_transfer(old, use_brotli), new):
+            regressions.append(f"{asset['path']}: {_format_bytes(_transfer(old, use_brotli))} → "
+                               f"{_format_bytes(new)}")
+
+    old_totals, new_totals = {}, {}
+    for side, items in ((old_totals, previous.values()), (new_totals, assets)):
+        for asset in items:
+            side[asset['type']] = side.get(asset['type'], 0) + _transfer(asset, use_brotli)
+    for group, total in sorted(new_totals.items()):
+        old = old_totals.get(group)
+        if old and grew(old, total):
+            regressions.append(f"{group} total: {_format_bytes(old)} → {_format_bytes(total)}")
+    return regressions, new_files, codecs
+
+
+def _format_bytes(size):
+    return '-' if size is None else format_bytes(size)
+
+
+def format_text(report):
+    lines = ["📦 Static asset budget report", "=" * 50]
+    lines.append(f"   {'type':<10} {'files':>5} {'raw':>10} {'gzip':>10} {'brotli':>10} {'transfer':>10}")
+    for group, total in report['totals'].items():
+        lines.append(f"   {group:<10} {total['files']:>5} {_format_bytes(total['raw']):>10} "
+                     f"{_format_bytes(total['gzip']):>10} {_format_bytes(total['brotli']):>10} "
+                     f"{_format_bytes(total['transfer']):>10}")
+    if brotli is None:
+        lines.append("ℹ️  Install the brotli package for brotli sizes (pip install brotli)")
+
+    largest = sorted(report['assets'], key=lambda asset: -asset['transfer'])[:10]
+    if largest:
+        lines += ["", "🔝 Largest files (transfer bytes):"]
+        lines += [f"   {_format_bytes(asset['transfer']):>10}  {asset['path']}" for asset in largest]
+
+    lines.append("")
+    if report['over_budget']:
+        lines.append(f"❌ {len(report['over_budget'])} over budget:")
+        lines += [f"   {problem}" for problem in report['over_budget']]
+    else:
+        lines.append("✅ All files within budget")
+
+    if report['regressions'] is not None:
+        if report['new_files']:
+            lines.append(f"ℹ️  {len(report['new_files'])} new file(s) since the baseline:")
+            lines += [f"   {message}" for message in report['new_files']]
+        if report['regressions']:
+            lines.append(f"❌ {len(report['regressions'])} regression(s) against the baseline:")
+            lines += [f"   {message}" for message in report['regressions']]
+        else:
+            lines.append("✅ No regressions against the baseline")
+        lines.append(f"   (compared on {report['compared_on']} transfer sizes)")
+
+    return "\n".join(lines) + "\n"
+
+
+def format_json(report):
+    return json.dumps(report, indent=2) + "\n"
+
+
+def load_budgets(path=None):
+    """DEFAULT_BUDGETS, with any per-type overrides from a JSON file merged in"""
+    budgets = {group: dict(limits) for group, limits in DEFAULT_BUDGETS.items()}
+    if path:
+        with open(path, 'r') as f:
+            for group, limits in json.load(f).items():
+                budgets.setdefault(group, {}).update(limits)
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report static asset sizes under public/")
+    parser.add_argument('--root', default='public',
+                        help="directory to measure")
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                        help="report format")
+    parser.add_argument('--output', metavar='PATH',
+                        help="write the report to a file instead of stdout")
+    parser.add_argument('--budgets', metavar='PATH',
+                        help='JSON file of per-type budgets, e.g. {"image": {"file": 150000, "total": 2000000}}')
+    parser.add_argument('--baseline', metavar='PATH',
+                        help="compare with a previous --format json report")
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help="allowed growth ratio against the baseline")
+    parser.add_argument('--jobs', type=int, default=min(8, os.cpu_count() or 1),
+                        help="worker threads (0 = one per core)")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error(f"--jobs must be 0 (one per core) or a positive number of threads, got {args.jobs}")
+
+    if not os.path.isdir(args.root):
+        parser.error(f"{args.root} is not a directory")
+
+    assets = scan_assets(args.root, args.jobs)
+    totals = summarize(assets)
+    budgets = load_budgets(args.budgets)
+
+    regressions = new_files = compared_on = None
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions, new_files, compared_on = compare(assets, json.load(f), args.threshold)
+
+    report = {
+        'root': args.root,
+        'brotli': brotli is not None,
+        'budgets': budgets,
+        'totals': totals,
+        'assets': assets,
+        'over_budget': check_budgets(assets, totals, budgets),
+        'regressions': regressions,
+        'new_files': new_files,
+        'compared_on': compared_on,
+    }
+    output = (format_json if args.format == 'json' else format_text)(report)
+
+    if args.output:
+        temp_path = args.output + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(output)
+        os.replace(temp_path, args.output)
+    else:
+        sys.stdout.write(output)
+
+    return 1 if report['over_budget'] or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -153,25 +153,15 @@ create_png() {
 # Create icons directory
 mkdir -p "public/icons"
 
-# Standard icons (non-maskable)
-create_png 16 "/tmp/aeye-perfect-logo.svg" "public/icons/favicon-16x16.png" "Favicon 16x16"
-create_png 32 "/tmp/aeye-perfect-logo.svg" "public/icons/favicon-32x32.png" "Favicon 32x32"
-create_png 48 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-48x48.png" "Icon 48x48"
-create_png 72 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-72x72.png" "Icon 72x72"
-create_png 96 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-96x96.png" "Icon 96x96"
-create_png 128 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-128x128.png" "Icon 128x128"
-create_png 144 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-144x144.png" "Icon 144x144"
-create_png 152 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-152x152.png" "Icon 152x152"
-create_png 167 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-167x167.png" "Icon 167x167"
-create_png 180 "/tmp/aeye-perfect-logo.svg" "public/icons/apple-touch-icon.png" "Apple Touch Icon"
-create_png 192 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-192x192.png" "Icon 192x192"
-create_png 256 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-256x256.png" "Icon 256x256"
-create_png 384 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-384x384.png" "Icon 384x384"
-create_png 512 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-512x512.png" "Icon 512x512"
-create_png 1024 "/tmp/aeye-perfect-logo.svg" "public/icons/icon-1024x1024.png" "Icon 1024x1024"
+# Standard icons (non-maskable), listed in icon-spec.json as size:filename
+for size_info in $(python3 icon_spec.py --list); do
+    create_png "${size_info%%:*}" "/tmp/aeye-perfect-logo.svg" "public/icons/${size_info#*:}" "${size_info#*:}"
+done
 
 # Maskable icons (with safe zone)
-create_png 512 "/tmp/aeye-perfect-maskable.svg" "public/icons/icon-512x512-maskable.png" "Maskable Icon 512x512"
+for size_info in $(python3 icon_spec.py --list --maskable); do
+    create_png "${size_info%%:*}" "/tmp/aeye-perfect-maskable.svg" "public/icons/${size_info#*:}" "Maskable ${size_info#*:}"
+done
 
 # Create favicon.ico
 if command -v convert &> /dev/null; then
@@ -4,72 +4,58 @@ Create perfect AEYE.NG logo icons for PWA
 This script generates high-quality, crisp icons that will look amazing on all devices
 """
 
+import argparse
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import math
+from functools import lru_cache
 
-def create_gradient_background(width, height):
+from icon_build import (add_build_arguments, build_icons, check_jobs, print_savings,
+                         renderer_fingerprint)
+from icon_cache import IconCache
+from icon_favicon import build_derived
+from icon_fonts import describe_font, load_font, resolve_font
+from icon_gradients import radial_gradient
+from icon_hashing import publish, restore_links
+from icon_layers import composite, draw_over, text_layer, text_width
+from icon_profile import finish_profiling, span, start_profiling
+from icon_spec import icon_sizes, load_icon_spec, select_targets
+
+# Preferred system fonts, in order; icon_fonts falls back to a directory scan
+BOLD_FONTS = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+]
+REGULAR_FONTS = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/liberation/LiberationSans.ttf",
+]
+
+def create_gradient_background(width, height, fill_canvas=False):
     """Create a professional gradient background"""
-    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(image)
-    
-    # Create radial gradient effect
+    # Radial gradient effect: dark blue 0f172a at the center to 1a365d outside
     center_x, center_y = width // 2, height // 3
     max_radius = int(math.sqrt(width**2 + height**2) * 0.7)
-    
-    for i in range(max_radius, 0, -2):
-        # Calculate color interpolation
-        progress = 1 - (i / max_radius)
-        
-        # Dark blue to darker blue gradient
-        r = int(26 + (15 - 26) * progress)  # 1a365d to 0f172a
-        g = int(54 + (23 - 54) * progress)
-        b = int(93 + (42 - 93) * progress)
-        
-        color = (r, g, b, 255)
-        
-        # Draw concentric circles for gradient effect
-        left = center_x - i
-        top = center_y - i
-        right = center_x + i
-        bottom = center_y + i
-        
-        if left >= 0 and top >= 0 and right < width and bottom < height:
-            draw.ellipse([left, top, right, bottom], fill=color)
-    
-    return image
+    colors = [(15, 23, 42), (26, 54, 93)]
 
-def create_aeye_logo(size, maskable=False):
-    """Create the AEYE.NG logo with professional styling"""
-    
-    # If maskable, add 20% padding for safe zone
-    if maskable:
-        content_size = int(size * 0.6)
-        padding = (size - content_size) // 2
-    else:
-        content_size = size
-        padding = 0
-    
-    # Create base image
-    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    
-    # Create gradient background
-    if maskable:
-        # Full bleed background for maskable
-        bg = create_gradient_background(size, size)
-        image.paste(bg, (0, 0))
-    else:
-        # Background with rounded corners
-        bg = create_gradient_background(content_size, content_size)
-        if padding > 0:
-            temp_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            temp_img.paste(bg, (padding, padding))
-            image = temp_img
-        else:
-            image = bg
-    
-    # Create drawing context
-    draw = ImageDraw.Draw(image)
+    if fill_canvas:
+        return radial_gradient(width, height, colors,
+                               center=(center_x, center_y), radius=max_radius)
+
+    # Classic look: only the part of the gradient that fits on the canvas.
+    # The original stacked ellipses every 2 px down from max_radius, so its
+    # outermost disc has max_radius's parity
+    visible_radius = min(center_x, center_y, width - 1 - center_x, height - 1 - center_y)
+    visible_radius -= (max_radius - visible_radius) % 2
+    t = visible_radius / max_radius
+    edge_color = tuple(round(inner * (1-t) + outer * t) for inner, outer in zip(*colors))
+
+    return radial_gradient(width, height, [colors[0], edge_color],
+                           center=(center_x, center_y), radius=visible_radius, fill=False)
+
+def aeye_layout(size, maskable=False):
+    """Positions and sizes of every element for one icon size"""
+    content_size = int(size * 0.6) if maskable else size
     
     # Calculate positions (center everything)
     center_x = size // 2
@@ -95,150 +81,253 @@ def create_aeye_logo(size, maskable=False):
         font_size = max(12, int(size * 0.14))
         sub_font_size = max(8, int(size * 0.08))
     
-    # Draw eye symbol with gold gradient effect
+    return {
+        'center_x': center_x,
+        'eye_y': eye_y,
+        'eye_rx': eye_rx,
+        'eye_ry': eye_ry,
+        'text_y': text_y,
+        'subtitle_y': subtitle_y,
+        'font_size': font_size,
+        'sub_font_size': sub_font_size,
+    }
+
+@lru_cache(maxsize=64)
+def aeye_eye_layer(size, maskable=False):
+    """Eye symbol sprite with gold gradient effect, and its position"""
+    layout = aeye_layout(size, maskable)
+    eye_rx, eye_ry = layout['eye_rx'], layout['eye_ry']
+    pupil_r = max(3, int(eye_rx * 0.18))
+    
+    # Sprite space: the eye is centered on (cx, cy); the pupil may be
+    # larger than the eye on tiny icons
+    cx, cy = max(eye_rx, pupil_r), max(eye_ry, pupil_r)
+    layer = Image.new('RGBA', (cx * 2 + 1, cy * 2 + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    
     # Outer eye (golden)
-    draw.ellipse([center_x - eye_rx, eye_y - eye_ry, 
-                  center_x + eye_rx, eye_y + eye_ry], 
+    draw.ellipse([cx - eye_rx, cy - eye_ry, 
+                  cx + eye_rx, cy + eye_ry], 
                  fill=(255, 215, 0, 230))  # Gold
     
     # Inner eye (dark)
     inner_rx = int(eye_rx * 0.65)
     inner_ry = int(eye_ry * 0.65)
-    draw.ellipse([center_x - inner_rx, eye_y - inner_ry, 
-                  center_x + inner_rx, eye_y + inner_ry], 
+    draw.ellipse([cx - inner_rx, cy - inner_ry, 
+                  cx + inner_rx, cy + inner_ry], 
                  fill=(15, 23, 42, 255))  # Dark blue
     
     # Pupil (golden)
-    pupil_r = max(3, int(eye_rx * 0.18))
-    draw.ellipse([center_x - pupil_r, eye_y - pupil_r, 
-                  center_x + pupil_r, eye_y + pupil_r], 
+    draw.ellipse([cx - pupil_r, cy - pupil_r, 
+                  cx + pupil_r, cy + pupil_r], 
                  fill=(255, 215, 0, 255))  # Gold
     
-    # Highlight (white)
+    # Highlight (white), blended over the pupil
     highlight_r = max(2, int(pupil_r * 0.4))
-    highlight_x = center_x + int(pupil_r * 0.3)
-    highlight_y = eye_y - int(pupil_r * 0.3)
-    draw.ellipse([highlight_x - highlight_r, highlight_y - highlight_r, 
-                  highlight_x + highlight_r, highlight_y + highlight_r], 
-                 fill=(255, 255, 255, 200))  # White highlight
-    
-    # Try to load a font, fallback to default if not available
-    try:
-        # Try to find system fonts
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-        sub_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", sub_font_size)
-    except:
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf", font_size)
-            sub_font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans.ttf", sub_font_size)
-        except:
-            # Fallback to default font
-            font = ImageFont.load_default()
-            sub_font = ImageFont.load_default()
-    
-    # Draw "AEYE" text with shadow effect
+    highlight_x = cx + int(pupil_r * 0.3)
+    highlight_y = cy - int(pupil_r * 0.3)
+    draw_over(layer, lambda draw: draw.ellipse(
+        [highlight_x - highlight_r, highlight_y - highlight_r, 
+         highlight_x + highlight_r, highlight_y + highlight_r], 
+        fill=(255, 255, 255, 200)))  # White highlight
+    
+    return layer, (layout['center_x'] - cx, layout['eye_y'] - cy)
+
+@lru_cache(maxsize=64)
+def aeye_wordmark_layer(size, maskable=False):
+    """Gold "AEYE" text sprite with its shadow, and its position"""
+    layout = aeye_layout(size, maskable)
+    font = load_font(resolve_font('bold', BOLD_FONTS), layout['font_size'])
     text = "AEYE"
     
-    # Get text size for centering
-    try:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-    except:
-        # Fallback for older Pillow versions
-        text_width, _ = draw.textsize(text, font=font)
+    shadow_offset = max(1, int(size * 0.003))
+    layer, (dx, dy) = text_layer(text, font, (255, 215, 0, 255),
+                                 shadow=((0, 0, 0, 100), (shadow_offset, shadow_offset * 2)))
     
-    text_x = center_x - text_width // 2
+    text_x = layout['center_x'] - text_width(font, text) // 2
+    return layer, (text_x + dx, layout['text_y'] + dy)
+
+@lru_cache(maxsize=64)
+def aeye_subtitle_layer(size, maskable=False):
+    """".NG" subtitle sprite and its position"""
+    layout = aeye_layout(size, maskable)
+    sub_font = load_font(resolve_font('regular', REGULAR_FONTS), layout['sub_font_size'])
+    subtitle = ".NG"
     
-    # Draw shadow
-    shadow_offset = max(1, int(size * 0.003))
-    draw.text((text_x + shadow_offset, text_y + shadow_offset * 2), text, 
-              fill=(0, 0, 0, 100), font=font)
+    layer, (dx, dy) = text_layer(subtitle, sub_font, (148, 163, 184, 230))
+    sub_x = layout['center_x'] - text_width(sub_font, subtitle) // 2
+    return layer, (sub_x + dx, layout['subtitle_y'] + dy)
+
+@lru_cache(maxsize=64)
+def aeye_accent_layer(size):
+    """Subtle accent lines for tech feel, and their position"""
+    line_y1 = int(size * 0.73)
+    line_y2 = int(size * 0.76)
+    line_start = int(size * 0.29)
+    line_end = int(size * 0.71)
+    width_1 = max(1, int(size * 0.002))
+    width_2 = max(1, int(size * 0.001))
     
-    # Draw main text in gold
-    draw.text((text_x, text_y), text, fill=(255, 215, 0, 255), font=font)
+    # Sprite space starts at (line_start, top)
+    top = line_y1 - width_1
+    layer = Image.new('RGBA', (line_end - line_start + 1, line_y2 + width_2 - top + 1),
+                      (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
     
-    # Draw ".NG" subtitle
-    subtitle = ".NG"
-    try:
-        bbox = draw.textbbox((0, 0), subtitle, font=sub_font)
-        sub_width = bbox[2] - bbox[0]
-    except:
-        sub_width, _ = draw.textsize(subtitle, font=sub_font)
+    draw.line([0, line_y1 - top, line_end - line_start, line_y1 - top], 
+              fill=(55, 65, 81, 150), width=width_1)
+    
+    draw.line([int(size * 0.34) - line_start, line_y2 - top,
+               int(size * 0.66) - line_start, line_y2 - top], 
+              fill=(55, 65, 81, 100), width=width_2)
+    
+    return layer, (line_start, top)
+
+def create_aeye_logo(size, maskable=False):
+    """Create the AEYE.NG logo with professional styling"""
+    
+    # If maskable, add 20% padding for safe zone
+    if maskable:
+        content_size = int(size * 0.6)
+        padding = (size - content_size) // 2
+    else:
+        content_size = size
+        padding = 0
     
-    sub_x = center_x - sub_width // 2
-    draw.text((sub_x, subtitle_y), subtitle, fill=(148, 163, 184, 230), font=sub_font)
+    # Create base image
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     
-    # Add subtle accent lines for tech feel (only for larger icons)
+    # Create gradient background
+    with span('gradient', size):
+        if maskable:
+            # Full bleed background for maskable
+            bg = create_gradient_background(size, size)
+            image.paste(bg, (0, 0))
+        else:
+            # Background with rounded corners
+            bg = create_gradient_background(content_size, content_size)
+            if padding > 0:
+                temp_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+                temp_img.paste(bg, (padding, padding))
+                image = temp_img
+            else:
+                image = bg
+    
+    # Composite the cached eye, wordmark and accent sprites
+    with span('eye', size):
+        layers = [aeye_eye_layer(size, maskable)]
+    with span('wordmark', size):
+        layers.append(aeye_wordmark_layer(size, maskable))
+    with span('subtitle', size):
+        layers.append(aeye_subtitle_layer(size, maskable))
     if size >= 128 and not maskable:
-        line_y1 = int(size * 0.73)
-        line_y2 = int(size * 0.76)
-        line_start = int(size * 0.29)
-        line_end = int(size * 0.71)
-        
-        draw.line([line_start, line_y1, line_end, line_y1], 
-                  fill=(55, 65, 81, 150), width=max(1, int(size * 0.002)))
-        
-        draw.line([int(size * 0.34), line_y2, int(size * 0.66), line_y2], 
-                  fill=(55, 65, 81, 100), width=max(1, int(size * 0.001)))
+        with span('accent', size):
+            layers.append(aeye_accent_layer(size))
+    
+    with span('composite', size):
+        for layer, position in layers:
+            composite(image, layer, position)
     
     return image
 
-def create_all_icons():
-    """Create all required icon sizes"""
-    
-    # Ensure icons directory exists
-    os.makedirs('public/icons', exist_ok=True)
-    
-    # Icon sizes to create
-    sizes = [
-        (16, 'favicon-16x16.png', False),
-        (32, 'favicon-32x32.png', False),
-        (48, 'icon-48x48.png', False),
-        (72, 'icon-72x72.png', False),
-        (96, 'icon-96x96.png', False),
-        (128, 'icon-128x128.png', False),
-        (144, 'icon-144x144.png', False),
-        (152, 'icon-152x152.png', False),
-        (167, 'icon-167x167.png', False),
-        (180, 'apple-touch-icon.png', False),
-        (192, 'icon-192x192.png', False),
-        (256, 'icon-256x256.png', False),
-        (384, 'icon-384x384.png', False),
-        (512, 'icon-512x512.png', False),
-        (512, 'icon-512x512-maskable.png', True),
-        (1024, 'icon-1024x1024.png', False),
-    ]
+def create_all_icons(pyramid=False, native_max=32, jobs=1, force=False, cache_size=64,
+                     encoding='standard', only=None, hashed=False, keep=3,
+                     profile=None, cprofile=False):
+    """Create all required icon sizes
+
+    With pyramid=True one master is rendered per variant and the smaller
+    sizes are downscaled from it, so every size is an exact scaled copy; it
+    is slower than direct rendering (see icon_build.render_pyramid). jobs > 1
+    spreads the renders over a process pool (0 = all cores).
+
+    Unchanged icons are skipped or restored from the build cache in
+    .icon-cache/ unless force=True. `encoding` picks a PNG profile from
+    icon_encode (dev, standard or release).
+
+    Sizes come from icon-spec.json. `only` is a list of glob patterns over
+    the spec's target names (e.g. ['favicon*']); matching targets and
+    their dependencies are built and everything else is left alone.
+
+    With hashed=True every icon is also published under a content-hashed
+    name (see icon_hashing), manifest.json, the pages listed in the spec
+    and browserconfig.xml link to those, and all but the `keep` newest
+    hashed copies of each icon are deleted. Without it, a build that writes
+    browserconfig.xml points all of those links back at the stable names.
+
+    `profile` names a Chrome trace file to time every stage into (the
+    AEYE_PROFILE environment variable does the same); cprofile=True also
+    dumps cProfile stats for the hottest stage. See icon_profile.
+    """
+    
+    spec = load_icon_spec()
+    sizes = icon_sizes(spec, style='aeye')
+    selected = select_targets(spec, only) if only else None
+    os.makedirs(spec['directory'], exist_ok=True)
+    
+    profiler, trace_path = start_profiling(profile, cprofile)
+    if profiler is not None and jobs != 1:
+        # Worker processes do not report their spans
+        print("⏱️  Profiling renders in-process; ignoring --jobs")
+        jobs = 1
     
     print("🎨 Creating perfect AEYE.NG logo icons with Python/Pillow...")
+    print(f"🔤 Fonts: {describe_font(resolve_font('bold', BOLD_FONTS))}, "
+          f"{describe_font(resolve_font('regular', REGULAR_FONTS))}")
     
-    for size, filename, maskable in sizes:
-        print(f"📱 Creating {filename} ({size}x{size}{'maskable' if maskable else ''})")
-        
-        # Create the icon
-        icon = create_aeye_logo(size, maskable)
-        
-        # Save with high quality
-        filepath = f'public/icons/{filename}'
-        icon.save(filepath, 'PNG', optimize=True, quality=95)
-        
-        print(f"✅ Created: {filepath}")
-    
-    # Create favicon.ico from 32x32 icon
-    try:
-        icon_32 = Image.open('public/icons/favicon-32x32.png')
-        icon_16 = Image.open('public/icons/favicon-16x16.png')
-        icon_32.save('public/favicon.ico', format='ICO', sizes=[(32, 32), (16, 16)])
-        print("✅ Created: public/favicon.ico")
-    except Exception as e:
-        print(f"⚠️ Could not create favicon.ico: {e}")
-        # Fallback: just copy 32x32 as favicon
-        try:
-            icon_32 = Image.open('public/icons/favicon-32x32.png')
-            icon_32.save('public/favicon.ico', 'PNG')
-            print("✅ Created: public/favicon.ico (PNG format)")
-        except:
-            print("❌ Could not create favicon.ico")
+    if pyramid:
+        print("🔺 Pyramid mode: downscaling every size from one master for consistency "
+              "(slower than direct rendering)")
+    
+    # PNG compression comes from the encoding profile
+    save_options = {}
+    
+    cache = IconCache(max_bytes=cache_size * 1024 * 1024, force=force)
+    savings = {} if encoding == 'release' else None
+    renderer_key = renderer_fingerprint(create_aeye_logo, [resolve_font('bold', BOLD_FONTS),
+                                                           resolve_font('regular', REGULAR_FONTS)])
+    
+    results = build_icons(create_aeye_logo, sizes, spec['directory'], save_options,
+                          pyramid=pyramid, native_max=native_max, jobs=jobs,
+                          cache=cache, renderer_key=renderer_key,
+                          encoding=encoding, savings=savings, only=selected)
+    
+    with span('icons'):
+        for (size, filename, maskable), filepath, status in results:
+            if status == 'fresh':
+                print(f"⏭️  Up to date: {filepath}")
+            elif status == 'hit':
+                print(f"♻️  Restored from cache: {filepath}")
+            else:
+                print(f"📱 Creating {filename} ({size}x{size}{'maskable' if maskable else ''})")
+                print(f"✅ Created: {filepath}")
+    
+    names = None
+    if hashed:
+        with span('publish'):
+            names, pruned, rewritten = publish(spec, keep)
+        print(f"🔐 Published {len(names)} content-hashed icons")
+        for path in pruned:
+            print(f"🧹 Pruned: {path}")
+        for path in rewritten:
+            print(f"✏️  Updated icon links: {path}")
+    elif selected is None or 'browserconfig.xml' in selected:
+        # browserconfig.xml is rewritten with the stable names; keep the
+        # manifest and page links in step with it
+        for path in restore_links(spec):
+            print(f"✏️  Restored stable icon links: {path}")
     
+    derived = build_derived(create_aeye_logo, spec, selected, cache, renderer_key, encoding, names)
+    for name, filepath, status in derived:
+        if status == 'fresh':
+            print(f"⏭️  Up to date: {filepath}")
+        elif status == 'hit':
+            print(f"♻️  Restored from cache: {filepath}")
+        else:
+            print(f"✅ Created: {filepath}")
+    
+    print(f"📦 Build cache: {cache.hits} hits, {cache.misses} misses")
+    print_savings(savings)
+    finish_profiling(profiler, trace_path)
     print()
     print("🎉 Perfect AEYE.NG logo icons created successfully!")
     print("📱 All icons are high-resolution with professional styling")
@@ -246,18 +335,22 @@ def create_all_icons():
     print("🛡️ Maskable icons have proper safe zone padding")
     print()
     print("Icon sizes created:")
-    print("  • Favicons: 16x16, 32x32")
+    print("  • Favicons: 16x16, 32x32 (favicon.ico: 16, 24, 32, 48, 64)")
     print("  • PWA Icons: 48x48, 72x72, 96x96, 128x128, 144x144, 152x152, 167x167, 192x192, 256x256, 384x384, 512x512, 1024x1024")
     print("  • Apple Touch: 180x180") 
     print("  • Maskable: 512x512")
+    print("  • Windows tiles: 128x128, 270x270, 558x558 (browserconfig.xml)")
 
 if __name__ == "__main__":
-    # Install PIL if not present
-    try:
-        from PIL import Image, ImageDraw, ImageFont
-    except ImportError:
-        print("Installing Pillow...")
-        os.system("python3 -m pip install Pillow")
-        from PIL import Image, ImageDraw, ImageFont
-    
-    create_all_icons()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create the AEYE.NG PWA icon set")
+    add_build_arguments(parser)
+    args = parser.parse_args()
+    check_jobs(parser, args.jobs)
+    
+    if args.only:
+        try:
+            select_targets(load_icon_spec(), args.only)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    create_all_icons(**vars(args))
\ No newline at end of file
@@ -4,283 +4,339 @@ Create a professional, corporate-quality AEYE.NG logo
 This will be a modern, clean design that looks professional on all devices
 """
 
+import argparse
 import os
-from PIL import Image, ImageDraw, ImageFont
-import math
+from PIL import Image, ImageDraw
+from collections import namedtuple
+from functools import lru_cache
+
+from icon_build import (add_build_arguments, build_icons, check_jobs, print_savings,
+                         renderer_fingerprint)
+from icon_cache import IconCache
+from icon_favicon import build_derived
+from icon_fonts import describe_font, load_font, resolve_font
+from icon_gradients import linear_gradient
+from icon_hashing import publish, restore_links
+from icon_layers import composite, draw_over, text_layer, text_width
+from icon_profile import finish_profiling, span, start_profiling
+from icon_spec import icon_sizes, load_icon_spec, select_targets
+
+# Professional color scheme
+# Modern blue gradient: Light blue -> Deep blue -> Navy
+GRADIENT_COLORS = [
+    (59, 130, 246),   # Blue-500
+    (37, 99, 235),    # Blue-600  
+    (30, 64, 175),    # Blue-700
+]
+
+# Gold accent color
+GOLD_COLOR = (255, 193, 7)  # Professional gold
+TEXT_COLOR = (255, 255, 255)  # White text
+
+# Preferred system fonts, in order; icon_fonts falls back to a directory scan
+FONT_PATHS = [
+    "/System/Library/Fonts/SF-Pro-Display-Bold.otf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf"
+]
+
+# Element positions and sizes as fractions of the icon size. Maskable
+# icons keep their content inside the safe zone.
+Layout = namedtuple('Layout', ['eye_y', 'eye_width', 'text_y', 'subtitle_y',
+                               'font_size', 'font_min', 'sub_font_size', 'sub_font_min',
+                               'accent_y', 'accent_width', 'corner_radius'])
+
+LAYOUT = Layout(eye_y=0.35, eye_width=0.25, text_y=0.58, subtitle_y=0.72,
+                font_size=0.12, font_min=16, sub_font_size=0.065, sub_font_min=10,
+                accent_y=0.82, accent_width=0.5, corner_radius=0.125)
+MASKABLE_LAYOUT = Layout(eye_y=0.375, eye_width=0.2, text_y=0.575, subtitle_y=0.675,
+                         font_size=0.08, font_min=16, sub_font_size=0.045, sub_font_min=12,
+                         accent_y=0.85, accent_width=0.4, corner_radius=0.0)
+
+# Everything a brand can change; hashable so the sprite caches key on it
+Theme = namedtuple('Theme', ['gradient', 'accent', 'text', 'wordmark', 'subtitle', 'font',
+                             'layout', 'maskable_layout'])
+
+DEFAULT_THEME = Theme(gradient=tuple(GRADIENT_COLORS), accent=GOLD_COLOR, text=TEXT_COLOR,
+                      wordmark="AEYE", subtitle=".NG", font=None,
+                      layout=LAYOUT, maskable_layout=MASKABLE_LAYOUT)
 
 def create_professional_gradient(width, height, colors):
     """Create a smooth professional gradient"""
-    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    
-    for y in range(height):
-        # Calculate gradient position (0 to 1)
-        progress = y / height
-        
-        # Interpolate between colors
-        if progress < 0.5:
-            # First half: color1 to color2
-            t = progress * 2
-            r = int(colors[0][0] * (1-t) + colors[1][0] * t)
-            g = int(colors[0][1] * (1-t) + colors[1][1] * t)
-            b = int(colors[0][2] * (1-t) + colors[1][2] * t)
-        else:
-            # Second half: color2 to color3
-            t = (progress - 0.5) * 2
-            r = int(colors[1][0] * (1-t) + colors[2][0] * t)
-            g = int(colors[1][1] * (1-t) + colors[2][1] * t)
-            b = int(colors[1][2] * (1-t) + colors[2][2] * t)
-        
-        # Draw horizontal line
-        for x in range(width):
-            image.putpixel((x, y), (r, g, b, 255))
-    
-    return image
+    # Built from a cached row table instead of one putpixel call per pixel
+    return linear_gradient(width, height, colors)
 
-def create_professional_logo(size, maskable=False):
-    """Create a professional, corporate-quality AEYE.NG logo"""
-    
-    # Professional color scheme
-    # Modern blue gradient: Light blue -> Deep blue -> Navy
-    gradient_colors = [
-        (59, 130, 246),   # Blue-500
-        (37, 99, 235),    # Blue-600  
-        (30, 64, 175),    # Blue-700
-    ]
-    
-    # Gold accent color
-    gold_color = (255, 193, 7)  # Professional gold
-    text_color = (255, 255, 255)  # White text
-    
-    # If maskable, add safe zone
-    if maskable:
-        content_size = int(size * 0.8)  # 80% of size for better safe zone
-        padding = (size - content_size) // 2
-    else:
-        content_size = size
-        padding = 0
-    
-    # Create base image
-    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    
-    # Create gradient background
-    bg = create_professional_gradient(size, size, gradient_colors)
-    image.paste(bg, (0, 0))
-    
-    # Create rounded corners for non-maskable
-    if not maskable:
-        # Create mask for rounded corners
-        mask = Image.new('L', (size, size), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        corner_radius = size // 8
-        mask_draw.rounded_rectangle([0, 0, size, size], radius=corner_radius, fill=255)
-        
-        # Apply mask
-        rounded_bg = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        rounded_bg.paste(image, (0, 0))
-        image = Image.composite(rounded_bg, Image.new('RGBA', (size, size), (0, 0, 0, 0)), mask)
-    
-    draw = ImageDraw.Draw(image)
-    
-    # Calculate positions
+def professional_layout(size, maskable=False, layout=None):
+    """Positions and sizes of every element for one icon size"""
+    layout = layout or (MASKABLE_LAYOUT if maskable else LAYOUT)
     center_x = size // 2
     
-    if maskable:
-        # Scale everything for safe zone
-        scale = 0.6
-        eye_y = int(center_x * 0.75)
-        text_y = int(center_x * 1.15)
-        subtitle_y = int(center_x * 1.35)
-        
-        font_size = max(16, int(size * 0.08))
-        sub_font_size = max(12, int(size * 0.045))
-    else:
-        # Full size design
-        eye_y = int(size * 0.35)
-        text_y = int(size * 0.58)
-        subtitle_y = int(size * 0.72)
-        
-        font_size = max(16, int(size * 0.12))
-        sub_font_size = max(10, int(size * 0.065))
+    # Maskable positions are measured on the even size, centered in the safe zone
+    base = center_x * 2 if maskable else size
+    eye_width = int(size * layout.eye_width)
+    
+    return {
+        'center_x': center_x,
+        'eye_y': int(base * layout.eye_y),
+        'eye_width': eye_width,
+        'eye_height': int(eye_width * 0.6),
+        'text_y': int(base * layout.text_y),
+        'subtitle_y': int(base * layout.subtitle_y),
+        'font_size': max(layout.font_min, int(size * layout.font_size)),
+        'sub_font_size': max(layout.sub_font_min, int(size * layout.sub_font_size)),
+    }
+
+@lru_cache(maxsize=64)
+def professional_eye_layer(size, maskable=False, layout=None, color=GOLD_COLOR):
+    """Gold eye symbol sprite and its position, drawn once per size"""
+    layout = professional_layout(size, maskable, layout)
+    eye_width, eye_height = layout['eye_width'], layout['eye_height']
+    shadow_offset = max(2, size // 200)
     
-    # Create professional eye symbol
-    eye_width = int(size * (0.2 if maskable else 0.25))
-    eye_height = int(eye_width * 0.6)
+    # Sprite space: the eye's bounding box starts at (0, 0)
+    layer = Image.new('RGBA', (eye_width + shadow_offset + 1, eye_height + shadow_offset + 1),
+                      (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    cx, cy = eye_width // 2, eye_height // 2
     
     # Outer eye shape with subtle shadow
-    shadow_offset = max(2, size // 200)
-    draw.ellipse([center_x - eye_width//2 + shadow_offset, 
-                  eye_y - eye_height//2 + shadow_offset,
-                  center_x + eye_width//2 + shadow_offset, 
-                  eye_y + eye_height//2 + shadow_offset], 
+    draw.ellipse([shadow_offset, shadow_offset,
+                  eye_width + shadow_offset, eye_height + shadow_offset],
                  fill=(0, 0, 0, 40))
     
     # Main eye shape - gold gradient effect
-    draw.ellipse([center_x - eye_width//2, eye_y - eye_height//2,
-                  center_x + eye_width//2, eye_y + eye_height//2], 
-                 fill=gold_color)
+    draw.ellipse([0, 0, eye_width, eye_height], fill=color)
     
     # Inner eye (iris)
     inner_width = int(eye_width * 0.7)
     inner_height = int(eye_height * 0.7)
-    draw.ellipse([center_x - inner_width//2, eye_y - inner_height//2,
-                  center_x + inner_width//2, eye_y + inner_height//2], 
+    draw.ellipse([cx - inner_width//2, cy - inner_height//2,
+                  cx + inner_width//2, cy + inner_height//2], 
                  fill=(20, 30, 60))  # Dark blue
     
     # Pupil
     pupil_size = int(inner_width * 0.35)
-    draw.ellipse([center_x - pupil_size//2, eye_y - pupil_size//2,
-                  center_x + pupil_size//2, eye_y + pupil_size//2], 
+    draw.ellipse([cx - pupil_size//2, cy - pupil_size//2,
+                  cx + pupil_size//2, cy + pupil_size//2], 
                  fill=(0, 0, 0))
     
-    # Eye highlight
+    # Eye highlight, blended over the pupil
     highlight_size = int(pupil_size * 0.4)
-    highlight_x = center_x + int(pupil_size * 0.25)
-    highlight_y = eye_y - int(pupil_size * 0.25)
-    draw.ellipse([highlight_x - highlight_size//2, highlight_y - highlight_size//2,
-                  highlight_x + highlight_size//2, highlight_y + highlight_size//2], 
-                 fill=(255, 255, 255, 200))
-    
-    # Load professional font
-    try:
-        # Try system fonts
-        font_paths = [
-            "/System/Library/Fonts/SF-Pro-Display-Bold.otf",
-            "/System/Library/Fonts/Helvetica.ttc",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf"
-        ]
-        
-        font = None
-        sub_font = None
-        
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                sub_font = ImageFont.truetype(font_path, sub_font_size)
-                break
-            except:
-                continue
-                
-        if not font:
-            font = ImageFont.load_default()
-            sub_font = ImageFont.load_default()
-            
-    except:
-        font = ImageFont.load_default()
-        sub_font = ImageFont.load_default()
-    
-    # Draw "AEYE" text with professional styling
-    text = "AEYE"
-    
-    # Get text dimensions
-    try:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-    except:
-        text_width, text_height = draw.textsize(text, font=font)
-    
-    text_x = center_x - text_width // 2
-    
-    # Text shadow for depth
+    highlight_x = cx + int(pupil_size * 0.25)
+    highlight_y = cy - int(pupil_size * 0.25)
+    draw_over(layer, lambda draw: draw.ellipse(
+        [highlight_x - highlight_size//2, highlight_y - highlight_size//2,
+         highlight_x + highlight_size//2, highlight_y + highlight_size//2],
+        fill=(255, 255, 255, 200)))
+    
+    position = (layout['center_x'] - eye_width//2, layout['eye_y'] - eye_height//2)
+    return layer, position
+
+@lru_cache(maxsize=64)
+def professional_wordmark_layer(size, maskable=False, layout=None, text="AEYE", color=TEXT_COLOR,
+                                font_path=None):
+    """"AEYE" text sprite with shadow and outline, and its position"""
+    layout = professional_layout(size, maskable, layout)
+    font = load_font(font_path or resolve_font('bold', FONT_PATHS), layout['font_size'])
+    
+    # Text shadow for depth, plus a subtle outline on larger icons in a
+    # single stroke pass
     shadow_offset = max(1, size // 300)
-    draw.text((text_x + shadow_offset, text_y + shadow_offset), text, 
-              fill=(0, 0, 0, 120), font=font)
-    
-    # Main text
-    draw.text((text_x, text_y), text, fill=text_color, font=font)
-    
-    # Add subtle text outline for better readability
-    outline_offset = 1
-    if size >= 256:
-        for dx in [-outline_offset, 0, outline_offset]:
-            for dy in [-outline_offset, 0, outline_offset]:
-                if dx != 0 or dy != 0:
-                    draw.text((text_x + dx, text_y + dy), text, 
-                             fill=(0, 0, 0, 60), font=font)
-        draw.text((text_x, text_y), text, fill=text_color, font=font)
-    
-    # Draw ".NG" subtitle
-    subtitle = ".NG"
-    try:
-        bbox = draw.textbbox((0, 0), subtitle, font=sub_font)
-        sub_width = bbox[2] - bbox[0]
-    except:
-        sub_width, _ = draw.textsize(subtitle, font=sub_font)
-    
-    sub_x = center_x - sub_width // 2
-    draw.text((sub_x, subtitle_y), subtitle, fill=(255, 255, 255, 200), font=sub_font)
-    
-    # Add professional accent line
+    stroke = (1, (0, 0, 0, 60)) if size >= 256 else None
+    layer, (dx, dy) = text_layer(text, font, color,
+                                 shadow=((0, 0, 0, 120), (shadow_offset, shadow_offset)),
+                                 stroke=stroke)
+    
+    text_x = layout['center_x'] - text_width(font, text) // 2
+    return layer, (text_x + dx, layout['text_y'] + dy)
+
+@lru_cache(maxsize=64)
+def professional_subtitle_layer(size, maskable=False, layout=None, subtitle=".NG", font_path=None):
+    """".NG" subtitle sprite and its position"""
+    layout = professional_layout(size, maskable, layout)
+    sub_font = load_font(font_path or resolve_font('bold', FONT_PATHS), layout['sub_font_size'])
+    
+    layer, (dx, dy) = text_layer(subtitle, sub_font, (255, 255, 255, 200))
+    sub_x = layout['center_x'] - text_width(sub_font, subtitle) // 2
+    return layer, (sub_x + dx, layout['subtitle_y'] + dy)
+
+@lru_cache(maxsize=64)
+def professional_accent_layer(size, maskable=False, layout=None):
+    """Three-line accent sprite and its position (only on 128 px and up)"""
+    layout = layout or (MASKABLE_LAYOUT if maskable else LAYOUT)
+    line_width = int(size * layout.accent_width)
+    layer = Image.new('RGBA', (line_width // 2 * 2 + 1, 3), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    
+    # Gradient line effect
+    for i in range(3):
+        alpha = 80 - (i * 20)
+        draw.line([0, i, line_width // 2 * 2, i], fill=(255, 255, 255, alpha), width=1)
+    
+    line_y = int(size * layout.accent_y)
+    return layer, (size // 2 - line_width // 2, line_y)
+
+@lru_cache(maxsize=64)
+def rounded_corner_tiles(size, radius):
+    """(box, mask) pairs covering the pixels outside a rounded square
+
+    Each mask is 255 where the corner must become transparent. Only the
+    radius-sized corner tiles are kept, not a full-size mask.
+    """
+    mask = Image.new('L', (size, size), 255)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, size, size], radius=radius, fill=0)
+    
+    extent = min(size, radius + 1)
+    boxes = [(0, 0), (size - extent, 0), (0, size - extent), (size - extent, size - extent)]
+    tiles = []
+    for x, y in dict.fromkeys(boxes):
+        box = (x, y, x + extent, y + extent)
+        tile = mask.crop(box)
+        if tile.getextrema()[1]:
+            tiles.append((box, tile))
+    return tiles
+
+def create_professional_logo(size, maskable=False, theme=None):
+    """Create a professional, corporate-quality AEYE.NG logo
+
+    `theme` swaps in another brand's colors, text, font and layout (see
+    Theme and icon_brands); the default is the AEYE.NG design. Sprites are
+    cached on just the theme fields they use, so brands that share a
+    color or layout share that work.
+    """
+    theme = theme or DEFAULT_THEME
+    layout = theme.maskable_layout if maskable else theme.layout
+    
+    # The gradient is the output buffer; everything else is drawn into it
+    with span('gradient', size):
+        image = create_professional_gradient(size, size, theme.gradient)
+    
+    # Create rounded corners for non-maskable
+    if not maskable:
+        with span('corner mask', size):
+            # Clear the corners in place: only the small corner tiles are masked
+            for box, tile in rounded_corner_tiles(size, int(size * layout.corner_radius)):
+                image.paste((0, 0, 0, 0), box, tile)
+    
+    # Composite the cached eye, wordmark and accent sprites
+    with span('eye', size):
+        layers = [professional_eye_layer(size, maskable, layout, theme.accent)]
+    with span('wordmark', size):
+        layers.append(professional_wordmark_layer(size, maskable, layout, theme.wordmark,
+                                                  theme.text, theme.font))
+    with span('subtitle', size):
+        layers.append(professional_subtitle_layer(size, maskable, layout, theme.subtitle,
+                                                  theme.font))
     if size >= 128:
-        line_y = int(size * (0.85 if maskable else 0.82))
-        line_width = int(size * (0.4 if maskable else 0.5))
-        line_start = center_x - line_width // 2
-        line_end = center_x + line_width // 2
-        
-        # Gradient line effect
-        for i in range(3):
-            alpha = 80 - (i * 20)
-            draw.line([line_start, line_y + i, line_end, line_y + i], 
-                     fill=(255, 255, 255, alpha), width=1)
+        with span('accent', size):
+            layers.append(professional_accent_layer(size, maskable, layout))
+    
+    with span('composite', size):
+        for layer, position in layers:
+            composite(image, layer, position)
     
     return image
 
-def create_all_professional_icons():
-    """Create all icon sizes with professional quality"""
-    
-    os.makedirs('public/icons', exist_ok=True)
-    
-    # Icon specifications
-    sizes = [
-        (16, 'favicon-16x16.png', False),
-        (32, 'favicon-32x32.png', False),
-        (48, 'icon-48x48.png', False),
-        (72, 'icon-72x72.png', False),
-        (96, 'icon-96x96.png', False),
-        (128, 'icon-128x128.png', False),
-        (144, 'icon-144x144.png', False),
-        (152, 'icon-152x152.png', False),
-        (167, 'icon-167x167.png', False),
-        (180, 'apple-touch-icon.png', False),
-        (192, 'icon-192x192.png', False),
-        (256, 'icon-256x256.png', False),
-        (384, 'icon-384x384.png', False),
-        (512, 'icon-512x512.png', False),
-        (512, 'icon-512x512-maskable.png', True),
-        (1024, 'icon-1024x1024.png', False),
-    ]
+def create_all_professional_icons(pyramid=False, native_max=32, jobs=1, force=False, cache_size=64,
+                                  encoding='standard', only=None, hashed=False, keep=3,
+                                  profile=None, cprofile=False):
+    """Create all icon sizes with professional quality
+
+    With pyramid=True one master is rendered per variant and the smaller
+    sizes are downscaled from it, so every size is an exact scaled copy; it
+    is slower than direct rendering (see icon_build.render_pyramid). jobs > 1
+    spreads the renders over a process pool (0 = all cores).
+
+    Unchanged icons are skipped or restored from the build cache in
+    .icon-cache/ unless force=True. `encoding` picks a PNG profile from
+    icon_encode (dev, standard or release).
+
+    Sizes come from icon-spec.json. `only` is a list of glob patterns over
+    the spec's target names (e.g. ['favicon*']); matching targets and
+    their dependencies are built and everything else is left alone.
+
+    With hashed=True every icon is also published under a content-hashed
+    name (see icon_hashing), manifest.json, the pages listed in the spec
+    and browserconfig.xml link to those, and all but the `keep` newest
+    hashed copies of each icon are deleted. Without it, a build that writes
+    browserconfig.xml points all of those links back at the stable names.
+
+    `profile` names a Chrome trace file to time every stage into (the
+    AEYE_PROFILE environment variable does the same); cprofile=True also
+    dumps cProfile stats for the hottest stage. See icon_profile.
+    """
+    
+    spec = load_icon_spec()
+    sizes = icon_sizes(spec, style='professional')
+    selected = select_targets(spec, only) if only else None
+    os.makedirs(spec['directory'], exist_ok=True)
+    
+    profiler, trace_path = start_profiling(profile, cprofile)
+    if profiler is not None and jobs != 1:
+        # Worker processes do not report their spans
+        print("⏱️  Profiling renders in-process; ignoring --jobs")
+        jobs = 1
     
     print("🎨 Creating professional AEYE.NG corporate logo...")
     print("✨ Features: Modern gradient, professional typography, clean design")
-    
-    for size, filename, maskable in sizes:
-        print(f"📱 Creating {filename} ({size}x{size}) {'[MASKABLE]' if maskable else ''}")
-        
-        # Create the professional icon
-        icon = create_professional_logo(size, maskable)
+    print(f"🔤 Font: {describe_font(resolve_font('bold', FONT_PATHS))}")
+    
+    if pyramid:
+        print("🔺 Pyramid mode: downscaling every size from one master for consistency "
+              "(slower than direct rendering)")
+    
+    # High-resolution metadata; compression comes from the encoding profile
+    save_options = {'dpi': (300, 300)}
+    
+    cache = IconCache(max_bytes=cache_size * 1024 * 1024, force=force)
+    savings = {} if encoding == 'release' else None
+    renderer_key = renderer_fingerprint(create_professional_logo,
+                                        [resolve_font('bold', FONT_PATHS)])
+    
+    results = build_icons(create_professional_logo, sizes, spec['directory'], save_options,
+                          pyramid=pyramid, native_max=native_max, jobs=jobs,
+                          cache=cache, renderer_key=renderer_key,
+                          encoding=encoding, savings=savings, only=selected)
+    
+    with span('icons'):
+        for (size, filename, maskable), filepath, status in results:
+            if status == 'fresh':
+                print(f"⏭️  Up to date: {filepath}")
+            elif status == 'hit':
+                print(f"♻️  Restored from cache: {filepath}")
+            else:
+                print(f"📱 Creating {filename} ({size}x{size}) {'[MASKABLE]' if maskable else ''}")
         
-        # Save with maximum quality
-        filepath = f'public/icons/{filename}'
-        icon.save(filepath, 'PNG', optimize=True, quality=100, dpi=(300, 300))
-        
-        file_size = os.path.getsize(filepath)
-        print(f"✅ Created: {filepath} ({file_size} bytes)")
-    
-    # Create high-quality favicon.ico
-    try:
-        icon_32 = Image.open('public/icons/favicon-32x32.png')
-        icon_16 = Image.open('public/icons/favicon-16x16.png')
-        icon_32.save('public/favicon.ico', format='ICO', 
-                    sizes=[(32, 32), (16, 16)], quality=100)
-        print("✅ Created: public/favicon.ico (multi-size)")
-    except Exception as e:
-        print(f"⚠️ Favicon creation issue: {e}")
-        try:
-            icon_32.save('public/favicon.ico', 'PNG')
-            print("✅ Created: public/favicon.ico (PNG fallback)")
-        except:
-            print("❌ Could not create favicon.ico")
+                file_size = os.path.getsize(filepath)
+                print(f"✅ Created: {filepath} ({file_size} bytes)")
+    
+    names = None
+    if hashed:
+        with span('publish'):
+            names, pruned, rewritten = publish(spec, keep)
+        print(f"🔐 Published {len(names)} content-hashed icons")
+        for path in pruned:
+            print(f"🧹 Pruned: {path}")
+        for path in rewritten:
+            print(f"✏️  Updated icon links: {path}")
+    elif selected is None or 'browserconfig.xml' in selected:
+        # browserconfig.xml is rewritten with the stable names; keep the
+        # manifest and page links in step with it
+        for path in restore_links(spec):
+            print(f"✏️  Restored stable icon links: {path}")
+    
+    derived = build_derived(create_professional_logo, spec, selected, cache, renderer_key, encoding, names)
+    for name, filepath, status in derived:
+        if status == 'fresh':
+            print(f"⏭️  Up to date: {filepath}")
+        elif status == 'hit':
+            print(f"♻️  Restored from cache: {filepath}")
+        else:
+            print(f"✅ Created: {filepath}")
     
+    print(f"📦 Build cache: {cache.hits} hits, {cache.misses} misses")
+    print_savings(savings)
+    finish_profiling(profiler, trace_path)
     print()
     print("🎉 PROFESSIONAL AEYE.NG LOGO COMPLETE!")
     print("🏢 Corporate-quality design with:")
@@ -294,11 +350,15 @@ def create_all_professional_icons():
     print("📱 This will look stunning on all devices!")
 
 if __name__ == "__main__":
-    try:
-        from PIL import Image, ImageDraw, ImageFont
-    except ImportError:
-        print("Installing Pillow...")
-        os.system("python3 -m pip install Pillow --user")
-        from PIL import Image, ImageDraw, ImageFont
-    
-    create_all_professional_icons()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create the professional AEYE.NG icon set")
+    add_build_arguments(parser)
+    args = parser.parse_args()
+    check_jobs(parser, args.jobs)
+    
+    if args.only:
+        try:
+            select_targets(load_icon_spec(), args.only)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    create_all_professional_icons(**vars(args))
\ No newline at end of file
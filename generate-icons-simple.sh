@@ -28,23 +28,8 @@ echo -e "${GREEN}📁 Using source image: $SOURCE_PNG${NC}"
 echo -e "${BLUE}🔄 Generating all icon sizes...${NC}"
 
 # Define required sizes
-declare -a SIZES=(
-    "16:favicon-16x16.png"
-    "32:favicon-32x32.png" 
-    "48:icon-48x48.png"
-    "72:icon-72x72.png"
-    "96:icon-96x96.png"
-    "128:icon-128x128.png"
-    "144:icon-144x144.png"
-    "152:icon-152x152.png"
-    "167:icon-167x167.png"
-    "180:apple-touch-icon.png"
-    "192:icon-192x192.png"
-    "256:icon-256x256.png"
-    "384:icon-384x384.png"
-    "512:icon-512x512.png"
-    "1024:icon-1024x1024.png"
-)
+# Sizes come from the shared icon spec (icon-spec.json) as size:filename
+declare -a SIZES=( $(python3 icon_spec.py --list) )
 
 # Generate each size using sips
 for size_info in "${SIZES[@]}"; do
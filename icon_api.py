@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Importable rendering API for the AEYE.NG icon renderers
+Returns encoded icon bytes for any (size, maskable, style, format) with an in-process LRU
+
+    from icon_api import get_icon
+    icon = get_icon(192, style='professional', format='webp')
+    icon.data, icon.content_type, icon.etag
+
+Renders are memoized by a RenderCache with a byte limit. Concurrent
+requests for the same uncached icon wait for the first one's render
+instead of starting their own.
+"""
+
+import hashlib
+import importlib
+import io
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from PIL import features
+
+from icon_encode import PROFILES, encode_png
+from icon_favicon import ico_bytes
+
+# Where each renderer style lives; modules are imported on first use
+RENDERERS = {
+    'aeye': ('create_perfect_icons', 'create_aeye_logo'),
+    'professional': ('create_professional_logo', 'create_professional_logo'),
+}
+
+MIN_SIZE = 16
+MAX_SIZE = 4096
+
+
+def _encode_pillow(icon, pillow_format, **options):
+    buffer = io.BytesIO()
+    icon.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+# MIME type and encoder per output format; the encoder takes (icon, encoding)
+FORMATS = {
+    'png': ('image/png', lambda icon, encoding: encode_png(icon, encoding)[0]),
+    # Lossless keeps the wordmark edges as sharp as the PNG
+    'webp': ('image/webp', lambda icon, encoding: _encode_pillow(icon, 'WEBP', lossless=True,
+                                                                 method=6 if encoding == 'release' else 4)),
+    'avif': ('image/avif', lambda icon, encoding: _encode_pillow(icon, 'AVIF', quality=90)),
+    'ico': ('image/x-icon', lambda icon, encoding: ico_bytes([icon], encoding)),
+}
+
+Icon = namedtuple('Icon', ['data', 'content_type', 'etag'])
+
+
+def available_formats():
+    """Formats this Pillow build can encode"""
+    return [name for name in FORMATS if name not in ('webp', 'avif') or features.check(name)]
+
+
+def renderer(style):
+    """The style's create_*_logo(size, maskable) function"""
+    module_name, function_name = RENDERERS[style]
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def check_request(size, maskable=False, style='professional', format='png', encoding='standard'):
+    """Raise ValueError for a request the API cannot serve"""
+    if style not in RENDERERS:
+        raise ValueError(f"Unknown style {style!r}; expected one of {', '.join(RENDERERS)}")
+    if format not in available_formats():
+        raise ValueError(f"Unsupported format {format!r}; expected one of {', '.join(available_formats())}")
+    if encoding not in PROFILES:
+        raise ValueError(f"Unknown encoding {encoding!r}; expected one of {', '.join(PROFILES)}")
+    if not MIN_SIZE <= size <= MAX_SIZE:
+        raise ValueError(f"Size must be between {MIN_SIZE} and {MAX_SIZE} px, got {size}")
+    if format == 'ico' and size > 256:
+        raise ValueError(f"ICO frames are at most 256 px, got {size}")
+
+
+def render_icon(size, maskable=False, style='professional', format='png', encoding='standard'):
+    """Render and encode one icon, uncached; returns an Icon"""
+    check_request(size, maskable, style, format, encoding)
+    content_type, encode = FORMATS[format]
+    data = encode(renderer(style)(size, maskable), encoding)
+    return Icon(data, content_type, '"%s"' % hashlib.sha256(data).hexdigest()[:32])
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered icons, bounded by total encoded bytes
+
+    get_or_render() coalesces concurrent misses: the first caller for a
+    key renders it while later callers wait on the same future. Icons
+    larger than max_bytes are returned but not kept.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = self._pending[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = render()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            self._store(key, value)
+        future.set_result(value)
+        return value
+
+    def _store(self, key, value):
+        size = len(value.data)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted.data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'coalesced': self.coalesced}
+
+
+default_cache = RenderCache()
+
+
+def get_icon(size, maskable=False, style='professional', format='png', encoding='standard',
+             cache=None):
+    """Cached render_icon(); uses the module's default_cache unless one is given"""
+    check_request(size, maskable, style, format, encoding)
+    cache = default_cache if cache is None else cache
+    key = (style, size, bool(maskable), format, encoding)
+    return cache.get_or_render(key, lambda: render_icon(size, maskable, style, format, encoding))
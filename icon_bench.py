@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the AEYE.NG icon renderers
+Times every stage per style, size and variant, records memory peaks, and
+compares the run against a stored baseline
+
+    python3 icon_bench.py --json bench.json              # record a run
+    python3 icon_bench.py --baseline bench.json          # fail on regressions
+
+Memory is reported twice: `peak_bytes` is the tracemalloc peak (Python
+objects such as encoded bytes and tables), and `rss_peak_bytes` is the
+growth of the process high-water mark, which also covers Pillow's pixel
+buffers. The second one needs Linux /proc and is None elsewhere.
+"""
+
+import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import PIL
+
+import icon_gradients
+from icon_encode import PROFILES, encode_png
+
+SIZES = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+# Where each renderer style lives and how to call its pieces
+STYLES = {
+    'aeye': {
+        'module': 'create_perfect_icons',
+        'render': 'create_aeye_logo',
+        'gradient': lambda module, size: module.create_gradient_background(size, size),
+        'driver': 'create_all_icons',
+    },
+    'professional': {
+        'module': 'create_professional_logo',
+        'render': 'create_professional_logo',
+        'gradient': lambda module, size: module.create_professional_gradient(
+            size, size, module.GRADIENT_COLORS),
+        'driver': 'create_all_professional_icons',
+    },
+}
+
+
+def _clear_caches(module):
+    """Drop the sprite, font and gradient memos so every run starts cold"""
+    for namespace in (module, icon_gradients):
+        for value in vars(namespace).values():
+            if hasattr(value, 'cache_clear'):
+                value.cache_clear()
+
+
+def _proc_status(field):
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _release_free_memory():
+    """Hand freed heap pages back to the OS so RSS growth is measured from a low base"""
+    try:
+        ctypes.CDLL(ctypes.util.find_library('c')).malloc_trim(0)
+    except (OSError, AttributeError, TypeError):
+        pass
+
+
+def _reset_peak_rss():
+    """Reset the kernel's high-water mark and return the current RSS, or None"""
+    _release_free_memory()
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return None
+    return _proc_status('VmRSS')
+
+
+def measure(function, repeat=3, setup=None):
+    """Time `function` and record its memory peaks
+
+    The timing runs and the memory run are kept apart because tracemalloc
+    slows allocation-heavy code down. `setup` runs before every call.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    rss_before = _reset_peak_rss()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rss_peak = _proc_status('VmHWM') if rss_before is not None else None
+
+    return {
+        'seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'peak_bytes': peak,
+        'rss_peak_bytes': None if rss_peak is None else max(0, rss_peak - rss_before),
+    }
+
+
+def bench_style(style, sizes=SIZES, repeat=3, encoding='standard'):
+    """Yield a result dict per (stage, size, maskable) for one renderer style"""
+    settings = STYLES[style]
+    module = importlib.import_module(settings['module'])
+    render = getattr(module, settings['render'])
+    clear = lambda: _clear_caches(module)
+
+    for size in sizes:
+        gradient = measure(lambda: settings['gradient'](module, size), repeat, clear)
+        yield {'style': style, 'stage': 'gradient', 'size': size, 'maskable': None, **gradient}
+
+        for maskable in (False, True):
+            rendered = measure(lambda: render(size, maskable), repeat, clear)
+            yield {'style': style, 'stage': 'render', 'size': size, 'maskable': maskable, **rendered}
+
+            icon = render(size, maskable)
+            encoded = measure(lambda: encode_png(icon, encoding), repeat)
+            yield {'style': style, 'stage': 'encode', 'size': size, 'maskable': maskable, **encoded}
+
+
+def bench_driver(style, repeat=1, encoding='standard'):
+    """Time a full create_all_* run in a scratch directory, cache disabled"""
+    settings = STYLES[style]
+    module = importlib.import_module(settings['module'])
+    driver = getattr(module, settings['driver'])
+
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = measure(lambda: driver(force=True, encoding=encoding), repeat,
+                                 lambda: _clear_caches(module))
+        finally:
+            os.chdir(previous)
+
+    return {'style': style, 'stage': 'driver', 'size': None, 'maskable': None, **result}
+
+
+def environment():
+    """Describe the machine and libraries a run was recorded with"""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+
+    return {
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'numpy': numpy_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _key(result):
+    return (result['style'], result['stage'], result['size'], result['maskable'])
+
+
+def compare(results, baseline, time_threshold=1.25, memory_threshold=1.25,
+            time_floor=0.002, memory_floor=256 * 1024):
+    """Return a message for every result that regressed against `baseline`
+
+    A metric regresses when it grows by more than its threshold ratio and
+    by more than its absolute floor, so sub-millisecond jitter on tiny
+    icons does not fail a run.
+    """
+    previous = {_key(result): result for result in baseline['results']}
+    checks = [('seconds', time_threshold, time_floor),
+              ('peak_bytes', memory_threshold, memory_floor),
+              ('rss_peak_bytes', memory_threshold, memory_floor)]
+
+    regressions = []
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        for metric, threshold, floor in checks:
+            now, before = result.get(metric), old.get(metric)
+            if now is None or before is None:
+                continue
+            if now > before * threshold and now - before > floor:
+                regressions.append(f"{_label(result)} {metric}: {before:g} → {now:g} "
+                                   f"(x{now / max(before, 1e-12):.2f}, limit x{threshold:g})")
+    return regressions
+
+
+def _label(result):
+    parts = [result['style'], result['stage']]
+    if result['size'] is not None:
+        parts.append(f"{result['size']}px")
+    if result['maskable']:
+        parts.append('maskable')
+    return ' '.join(parts)
+
+
+def _megabytes(value):
+    return '     -' if value is None else f"{value / (1024 * 1024):6.1f}"
+
+
+def print_results(results):
+    print(f"   {'benchmark':<36} {'best ms':>10} {'median ms':>10} {'py MB':>7} {'rss MB':>7}")
+    for result in results:
+        print(f"   {_label(result):<36} {result['seconds'] * 1000:10.2f} "
+              f"{result['median_seconds'] * 1000:10.2f} {_megabytes(result['peak_bytes']):>7} "
+              f"{_megabytes(result['rss_peak_bytes']):>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AEYE.NG icon renderers")
+    parser.add_argument('--styles', nargs='+', choices=sorted(STYLES), default=sorted(STYLES),
+                        help="renderer styles to benchmark")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES),
+                        help="icon sizes in pixels")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per benchmark; the best one is compared")
+    parser.add_argument('--encoding', choices=sorted(PROFILES), default='standard',
+                        help="PNG encoding profile for the encode and driver stages")
+    parser.add_argument('--no-drivers', action='store_true',
+                        help="skip the full create_all_* runs")
+    parser.add_argument('--json', metavar='PATH',
+                        help="write the results as JSON ('-' for stdout)")
+    parser.add_argument('--baseline', metavar='PATH',
+                        help="compare against a previous --json run and fail on regressions")
+    parser.add_argument('--time-threshold', type=float, default=1.25,
+                        help="allowed slowdown ratio against the baseline")
+    parser.add_argument('--memory-threshold', type=float, default=1.25,
+                        help="allowed memory growth ratio against the baseline")
+    parser.add_argument('--time-floor', type=float, default=0.002,
+                        help="ignore slowdowns smaller than this many seconds")
+    parser.add_argument('--memory-floor', type=int, default=256 * 1024,
+                        help="ignore memory growth smaller than this many bytes")
+    args = parser.parse_args(argv)
+
+    # Progress goes to stderr when the JSON report goes to stdout
+    log = sys.stderr if args.json == '-' else sys.stdout
+
+    results = []
+    for style in args.styles:
+        print(f"⏱️  Benchmarking {style} renderer...", file=log)
+        results.extend(bench_style(style, args.sizes, args.repeat, args.encoding))
+        if not args.no_drivers:
+            results.append(bench_driver(style, 1, args.encoding))
+
+    with contextlib.redirect_stdout(log):
+        print_results(results)
+
+    report = {
+        'environment': environment(),
+        'settings': {'encoding': args.encoding, 'repeat': args.repeat},
+        'results': results,
+    }
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Results written to {args.json}", file=log)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    if baseline.get('settings') != report['settings']:
+        print(f"⚠️  Baseline settings differ: {baseline.get('settings')} vs {report['settings']}",
+              file=log)
+
+    regressions = compare(results, baseline, args.time_threshold, args.memory_threshold,
+                          args.time_floor, args.memory_floor)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) against {args.baseline}:", file=log)
+        for message in regressions:
+            print(f"   {message}", file=log)
+        return 1
+
+    print(f"✅ No regressions against {args.baseline}", file=log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
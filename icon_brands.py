@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Multi-brand icon generation from a theme config
+Renders the full professional icon set for every brand in a YAML or JSON file
+
+    python3 icon_brands.py brands.yaml                 # brands/<name>/icons/..., brands/<name>/favicon.ico
+    python3 icon_brands.py brands.json --brand acme --encoding dev
+
+A config has optional `defaults` merged into every brand and a `brands`
+list; any Theme field left out keeps the AEYE.NG value:
+
+    output: brands
+    defaults:
+      gradient: ['#3B82F6', '#2563EB', '#1E40AF']
+    brands:
+      - name: acme
+        wordmark: ACME
+        subtitle: .IO
+        accent: '#FF5722'
+        layout: {text_y: 0.6}
+
+Every brand renders in one process, so gradient row tables, corner masks,
+loaded fonts and sprites that brands have in common are computed once.
+Icons are keyed by their theme in the shared build cache, so brands with
+identical themes (or unchanged since the last run) are not re-rendered.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from functools import partial
+
+from create_professional_logo import DEFAULT_THEME, FONT_PATHS, Theme, create_professional_logo
+from icon_build import build_icons, check_jobs, renderer_fingerprint
+from icon_cache import IconCache, fingerprint
+from icon_encode import PROFILES
+from icon_favicon import FAVICON_SIZES, build_favicon
+from icon_fonts import FontNotFoundError, resolve_font
+from icon_spec import icon_sizes, load_icon_spec
+
+try:
+    import yaml
+except ImportError:
+    # Only needed for .yaml/.yml configs
+    yaml = None
+
+BRAND_NAME = re.compile(r'[\w.-]+')
+COLOR_FIELDS = {'accent', 'text'}
+LAYOUT_FIELDS = ('layout', 'maskable_layout')
+
+# Allowed (low, high) for each Layout value: positions and sizes are
+# fractions of the icon (sizes must be non-zero), minimum font sizes are
+# whole pixels and the corner radius can at most round the icon into a circle
+LAYOUT_RANGES = {
+    'eye_y': (0, 1), 'text_y': (0, 1), 'subtitle_y': (0, 1), 'accent_y': (0, 1),
+    'eye_width': (0, 1), 'font_size': (0, 1), 'sub_font_size': (0, 1), 'accent_width': (0, 1),
+    'font_min': (1, 1024), 'sub_font_min': (1, 1024),
+    'corner_radius': (0, 0.5),
+}
+NONZERO_LAYOUT = {'eye_width', 'font_size', 'sub_font_size', 'accent_width'}
+INTEGER_LAYOUT = {'font_min', 'sub_font_min'}
+
+
+def parse_color(value):
+    """'#3B82F6', '3B82F6' or [59, 130, 246] -> (59, 130, 246)"""
+    if isinstance(value, str):
+        match = re.fullmatch(r'#?([0-9a-fA-F]{6})', value.strip())
+        if match is None:
+            raise ValueError(f"invalid color {value!r}; expected #RRGGBB")
+        return tuple(int(match.group(1)[i:i + 2], 16) for i in (0, 2, 4))
+    if isinstance(value, (list, tuple)) and len(value) == 3 and all(
+            isinstance(channel, int) and 0 <= channel <= 255 for channel in value):
+        return tuple(value)
+    raise ValueError(f"invalid color {value!r}; expected #RRGGBB or [r, g, b]")
+
+
+def check_layout_value(key, value):
+    """Raise ValueError unless `value` is a number in LAYOUT_RANGES[key]"""
+    numeric = int if key in INTEGER_LAYOUT else (int, float)
+    if isinstance(value, bool) or not isinstance(value, numeric):
+        kind = "a whole number" if key in INTEGER_LAYOUT else "a number"
+        raise ValueError(f"{key} must be {kind}, got {value!r}")
+    low, high = LAYOUT_RANGES[key]
+    if not low <= value <= high or (key in NONZERO_LAYOUT and value == 0):
+        raise ValueError(f"{key} must be {'above' if key in NONZERO_LAYOUT else 'at least'} "
+                         f"{low} and at most {high}, got {value!r}")
+
+
+def make_theme(settings, name='brand'):
+    """Build a Theme from config settings, starting from DEFAULT_THEME
+
+    >>> make_theme({'gradient': ['#FFFFFF', [0, 0, 0]]}).gradient
+    ((255, 255, 255), (0, 0, 0))
+    >>> make_theme({'gradient': '#FFFFFF'}, 'acme')
+    Traceback (most recent call last):
+    ...
+    ValueError: acme: gradient: expected a list of colors such as ['#3B82F6', '#1E40AF'], got '#FFFFFF'
+    """
+    unknown = set(settings) - set(Theme._fields) - {'name', 'output'}
+    if unknown:
+        raise ValueError(f"{name}: unknown theme keys {', '.join(sorted(unknown))}")
+
+    values = DEFAULT_THEME._asdict()
+    for field, value in settings.items():
+        if field in ('name', 'output'):
+            continue
+        try:
+            if field == 'gradient':
+                if not isinstance(value, (list, tuple)):
+                    raise ValueError(f"expected a list of colors such as ['#3B82F6', '#1E40AF'], "
+                                     f"got {value!r}")
+                if len(value) < 2:
+                    raise ValueError("a gradient needs at least 2 colors")
+                value = tuple(parse_color(color) for color in value)
+            elif field in COLOR_FIELDS:
+                value = parse_color(value)
+            elif field in LAYOUT_FIELDS:
+                layout = values[field]
+                if not isinstance(value, dict):
+                    raise ValueError("expected a mapping of layout keys to numbers")
+                unknown = set(value) - set(layout._fields)
+                if unknown:
+                    raise ValueError(f"unknown layout keys {', '.join(sorted(unknown))}")
+                for key, number in value.items():
+                    check_layout_value(key, number)
+                value = layout._replace(**value)
+            elif field == 'font' and value is not None and not os.path.isfile(value):
+                raise ValueError(f"font file not found: {value}")
+            elif field in ('wordmark', 'subtitle'):
+                value = str(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{name}: {field}: {e}") from None
+        values[field] = value
+    return Theme(**values)
+
+
+def load_brands(path, output=None):
+    """Read a theme config; returns [(name, theme, directory)] in config order"""
+    with open(path, 'r') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ValueError("YAML configs need PyYAML (pip install pyyaml); or use JSON")
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    output = output or config.get('output', 'brands')
+    defaults = config.get('defaults', {})
+    brands = []
+    names = set()
+    for entry in config.get('brands', []):
+        name = str(entry.get('name', ''))
+        if not BRAND_NAME.fullmatch(name):
+            raise ValueError(f"Brand names must be non-empty and file-name safe: {name!r}")
+        if name in names:
+            raise ValueError(f"Duplicate brand in {path}: {name}")
+        names.add(name)
+        settings = {**defaults, **entry}
+        # Layouts merge key by key, so a brand can move one element and
+        # keep the rest of the defaults' layout overrides
+        for field in LAYOUT_FIELDS:
+            if isinstance(defaults.get(field), dict) and isinstance(entry.get(field), dict):
+                settings[field] = {**defaults[field], **entry[field]}
+        theme = make_theme(settings, name)
+        brands.append((name, theme, entry.get('output', os.path.join(output, name))))
+
+    if not brands:
+        raise ValueError(f"No brands in {path}")
+    return brands
+
+
+def build_brand(name, theme, directory, sizes, cache, base_key, encoding='standard', jobs=1,
+                pyramid=False, native_max=32):
+    """Render one brand's icons into directory/icons and its favicon.ico
+
+    Yields (path, status) like icon_build.build_icons. The caller saves
+    `cache` once all brands are built. The system font is only looked up
+    for brands that do not set their own `font`.
+    """
+    render = partial(create_professional_logo, theme=theme)
+    font = theme.font or resolve_font('bold', FONT_PATHS)
+    renderer_key = fingerprint([font], base_key, theme)
+    icons_directory = os.path.join(directory, 'icons')
+    os.makedirs(icons_directory, exist_ok=True)
+
+    results = build_icons(render, sizes, icons_directory, {'dpi': (300, 300)},
+                          pyramid=pyramid, native_max=native_max, jobs=jobs, cache=cache,
+                          renderer_key=renderer_key, encoding=encoding, save_cache=False)
+    for _, path, status in results:
+        yield path, status
+
+    favicon = {'path': os.path.join(directory, 'favicon.ico'), 'sizes': FAVICON_SIZES}
+    yield build_favicon(render, favicon, cache, renderer_key, encoding)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create icon sets for every brand in a theme config")
+    parser.add_argument('config', help="YAML or JSON theme config")
+    parser.add_argument('--brand', action='append', metavar='NAME',
+                        help="build only this brand; repeatable")
+    parser.add_argument('--output', metavar='DIR',
+                        help="root directory for the per-brand output (default: the config's, or brands)")
+    parser.add_argument('--encoding', choices=sorted(PROFILES), default='standard',
+                        help="PNG encoding profile: dev (fast), standard or release (smallest)")
+    parser.add_argument('--pyramid', action='store_true',
+                        help="derive every size from one master per variant so all sizes share its "
+                             "proportions (slower than rendering each size directly)")
+    parser.add_argument('--native-max', type=int, default=32,
+                        help="in pyramid mode, render sizes up to this natively (0 = never)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="render each brand's icons in N worker processes (0 = all cores)")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the build cache and re-render every icon")
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help="build cache size limit in MB, shared by all brands")
+    args = parser.parse_args(argv)
+    check_jobs(parser, args.jobs)
+
+    try:
+        brands = load_brands(args.config, args.output)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.brand:
+        unknown = set(args.brand) - {name for name, _, _ in brands}
+        if unknown:
+            parser.error(f"unknown brands: {', '.join(sorted(unknown))}")
+        brands = [brand for brand in brands if brand[0] in args.brand]
+
+    sizes = icon_sizes(load_icon_spec(), style='professional')
+    cache = IconCache(max_bytes=args.cache_size * 1024 * 1024, force=args.force)
+    base_key = renderer_fingerprint(create_professional_logo, [])
+
+    print(f"🎨 Creating icons for {len(brands)} brands ({len(sizes)} icons + favicon.ico each)")
+    start = time.perf_counter()
+    for name, theme, directory in brands:
+        counts = {'fresh': 0, 'hit': 0, 'miss': 0}
+        try:
+            for _, status in build_brand(name, theme, directory, sizes, cache, base_key,
+                                         args.encoding, args.jobs, args.pyramid, args.native_max):
+                counts[status] += 1
+        except FontNotFoundError as e:
+            cache.save()
+            parser.error(f"{name}: {e}; set `font` for this brand")
+        print(f"✅ {name}: {directory} ({counts['miss']} rendered, {counts['hit']} shared from cache, "
+              f"{counts['fresh']} up to date)")
+
+    cache.save()
+    print(f"📦 Build cache: {cache.hits} hits, {cache.misses} misses "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Shared build helpers for the AEYE.NG icon generators
+Both create_all_* drivers use these to turn a sizes table into images
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+import icon_encode
+import icon_gradients
+import icon_layers
+from icon_cache import fingerprint
+from icon_encode import PROFILES, encode_png
+from icon_profile import DEFAULT_TRACE, PROFILE_ENV, span
+
+
+def add_build_arguments(parser):
+    """Add the command line options shared by both icon drivers"""
+    parser.add_argument('--pyramid', action='store_true',
+                        help="derive every size from one master per variant so all sizes share its "
+                             "proportions (slower than rendering each size directly)")
+    parser.add_argument('--native-max', type=int, default=32,
+                        help="in pyramid mode, render sizes up to this natively (0 = never)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="render icons in N worker processes (0 = all cores)")
+    parser.add_argument('--encoding', choices=sorted(PROFILES), default='standard',
+                        help="PNG encoding profile: dev (fast), standard or release (smallest)")
+    parser.add_argument('--only', action='append', metavar='PATTERN',
+                        help="build only targets matching this glob (plus their dependencies); repeatable")
+    parser.add_argument('--hashed', action='store_true',
+                        help="also publish content-hashed copies and point manifest.json and the pages at them")
+    parser.add_argument('--keep', type=int, default=3,
+                        help="with --hashed, hashed copies to keep per icon (older ones are deleted)")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the build cache and re-render every icon")
+    parser.add_argument('--cache-size', type=int, default=64,
+                        help="build cache size limit in MB (least recently used evicted first)")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_TRACE, metavar='TRACE',
+                        help=f"time every stage and write a Chrome trace (default {DEFAULT_TRACE}; "
+                             f"also enabled by {PROFILE_ENV}=path)")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="with profiling on, also dump cProfile stats for the hottest stage")
+
+
+def check_jobs(parser, jobs, option='--jobs'):
+    """parser.error() unless `jobs` is a valid worker count (0 = all cores)"""
+    if jobs < 0:
+        parser.error(f"{option} must be 0 (all cores) or a positive number of workers, got {jobs}")
+
+
+def renderer_fingerprint(render, font_paths):
+    """Hash the renderer's source, the shared helper modules and the font files"""
+    sources = [sys.modules[render.__module__].__file__, __file__,
+               icon_gradients.__file__, icon_layers.__file__, icon_encode.__file__]
+    return fingerprint(sources + list(font_paths))
+
+
+def render_pyramid(render, sizes, native_max=32):
+    """Render one master per variant and derive the smaller sizes from it
+
+    `render(size, maskable)` is only called for the largest size of each
+    variant (normal and maskable). Every smaller size is produced from the
+    level directly above it: a box reduce when the ratio is a whole number,
+    Lanczos otherwise. Sizes at or below `native_max` are rendered natively
+    instead, since a downscaled master loses legibility at favicon sizes
+    (0 disables this).
+
+    This is a consistency mode, not a speed-up: every size is a scaled copy
+    of one master, so proportions and anti-aliasing cannot drift between
+    sizes through per-size rounding. Since the renderers reuse cached
+    gradients and sprites, rendering each size directly is about twice as
+    fast as the resampling chain.
+
+    Returns a dict mapping (size, maskable) to an RGBA image.
+    """
+    images = {}
+
+    for maskable in sorted({entry[2] for entry in sizes}):
+        levels = sorted({size for size, _, entry_maskable in sizes
+                         if entry_maskable == maskable}, reverse=True)
+
+        with span('render', levels[0], maskable=maskable):
+            master = render(levels[0], maskable)
+        images[(levels[0], maskable)] = master
+
+        # Resample premultiplied so transparent corners do not bleed color
+        current, current_size = master.convert('RGBa'), levels[0]
+
+        for size in levels[1:]:
+            if size <= native_max:
+                with span('render', size, maskable=maskable):
+                    images[(size, maskable)] = render(size, maskable)
+                continue
+
+            with span('downscale', size, maskable=maskable):
+                if current_size % size == 0:
+                    current = current.reduce(current_size // size)
+                else:
+                    current = current.resize((size, size), Image.LANCZOS)
+            current_size = size
+
+            images[(size, maskable)] = current.convert('RGBA')
+
+    return images
+
+
+def _render_png(render, size, maskable, encoding, save_options):
+    """Worker: render one icon and encode it"""
+    with span('render', size, maskable=maskable):
+        icon = render(size, maskable)
+    return _encode_png(icon, encoding, save_options)
+
+
+def _encode_png(icon, encoding, save_options):
+    with span('encode', icon.width, encoding=encoding):
+        return encode_png(icon, encoding, save_options)
+
+
+def _write(path, data):
+    with span('write', bytes=len(data)):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def build_icons(render, sizes, directory, save_options, pyramid=False, native_max=32, jobs=1,
+                cache=None, renderer_key='', encoding='standard', savings=None, only=None,
+                save_cache=True):
+    """Render and save every (size, filename, maskable) entry
+
+    Yields ((size, filename, maskable), filepath, status) in the order of
+    `sizes` as each icon is written. With jobs > 1 the renders and PNG
+    encodes run in a process pool, largest sizes first so the slowest icon
+    does not start last; results are still yielded in table order. jobs=0
+    uses every core.
+
+    With an IconCache, each target is keyed by `renderer_key` plus its own
+    parameters. status is 'fresh' when the file on disk is already up to
+    date, 'hit' when it was restored from the cache and 'miss' when it had
+    to be rendered.
+
+    `encoding` names an icon_encode profile. If `savings` is a dict, it
+    receives filepath -> (baseline_bytes, final_bytes) for every icon
+    encoded in this run.
+
+    `only` is an optional set of filenames to build; the rest of `sizes`
+    is skipped (but still shapes the pyramid, so outputs match a full build).
+    Pass save_cache=False when the caller saves the cache itself, e.g.
+    after several build_icons calls.
+    """
+    paths = [os.path.join(directory, filename) for _, filename, _ in sizes]
+    layout = (native_max, sorted(sizes)) if pyramid else None
+    keys = [fingerprint([], renderer_key, size, maskable, encoding, save_options, layout)
+            for size, _, maskable in sizes]
+
+    wanted = [index for index, (_, filename, _) in enumerate(sizes)
+              if only is None or filename in only]
+
+    ready = {}
+    for index in wanted:
+        path = paths[index]
+        if cache is None:
+            continue
+        if cache.is_fresh(path, keys[index]):
+            ready[index] = 'fresh'
+            continue
+        data = cache.get(keys[index])
+        if data is not None:
+            _write(path, data)
+            ready[index] = 'hit'
+
+    todo = [index for index in wanted if index not in ready]
+    images = render_pyramid(render, sizes, native_max) if pyramid and todo else None
+
+    def task_args(index):
+        size, _, maskable = sizes[index]
+        if images is not None:
+            return _encode_png, images[(size, maskable)], encoding, save_options
+        return _render_png, render, size, maskable, encoding, save_options
+
+    pool = ProcessPoolExecutor(max_workers=jobs or None) if jobs != 1 and todo else None
+    futures = {}
+    if pool is not None:
+        for index in sorted(todo, key=lambda index: -sizes[index][0]):
+            function, *args = task_args(index)
+            futures[index] = pool.submit(function, *args)
+
+    try:
+        for index in wanted:
+            entry = sizes[index]
+            if index in ready:
+                cache.hits += 1
+                if ready[index] == 'hit':
+                    cache.record(paths[index], keys[index])
+                yield entry, paths[index], ready[index]
+                continue
+
+            if pool is not None:
+                data, baseline = futures[index].result()
+            else:
+                function, *args = task_args(index)
+                data, baseline = function(*args)
+
+            if savings is not None:
+                savings[paths[index]] = (baseline, len(data))
+            _write(paths[index], data)
+            if cache is not None:
+                cache.misses += 1
+                cache.put(keys[index], data)
+                cache.record(paths[index], keys[index])
+            yield entry, paths[index], 'miss'
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if cache is not None and save_cache:
+        cache.save()
+
+
+def print_savings(savings):
+    """Print bytes saved per file compared to the baseline encoding"""
+    if not savings:
+        return
+
+    print("📉 Encoding report (baseline → final):")
+    for path, (baseline, final) in savings.items():
+        print(f"   {path}: {baseline} → {final} bytes (-{baseline - final})")
+    total_baseline = sum(baseline for baseline, _ in savings.values())
+    total_final = sum(final for _, final in savings.values())
+    print(f"   Total: {total_baseline} → {total_final} bytes (-{total_baseline - total_final})")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Content-addressed build cache for the AEYE.NG icon generators
+Rendered PNG bytes are stored by a hash of everything that affects them
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import PIL
+
+
+def fingerprint(paths, *values):
+    """Hash the bytes of the given files plus any extra values
+
+    Missing files hash as missing, so a font appearing or disappearing
+    changes the fingerprint too.
+    """
+    digest = hashlib.sha256()
+    digest.update(PIL.__version__.encode())
+
+    for path in paths:
+        digest.update(path.encode())
+        try:
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            digest.update(b'<missing>')
+
+    digest.update(repr(values).encode())
+    return digest.hexdigest()
+
+
+class IconCache:
+    """Rendered PNG store with LRU eviction and a build manifest
+
+    The manifest remembers, for every output file, the key it was built
+    from plus its size and mtime, so unchanged targets can be skipped
+    without touching them. Blobs are evicted least recently used first
+    once the store grows past max_bytes.
+    """
+
+    def __init__(self, directory='.icon-cache', max_bytes=64 * 1024 * 1024, force=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.force = force
+        self.hits = 0
+        self.misses = 0
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        self.outputs = manifest.get('outputs', {})
+        self.blobs = manifest.get('blobs', {})
+
+    def _blob_path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.png')
+
+    def is_fresh(self, path, key):
+        """True when `path` still holds exactly what `key` produced"""
+        if self.force:
+            return False
+
+        record = self.outputs.get(path)
+        if not record or record['key'] != key:
+            return False
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return stat.st_size == record['size'] and stat.st_mtime_ns == record['mtime_ns']
+
+    def get(self, key):
+        """Return the cached PNG bytes for `key`, or None"""
+        if self.force or key not in self.blobs:
+            return None
+
+        try:
+            with open(self._blob_path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            del self.blobs[key]
+            return None
+
+        self.blobs[key]['used'] = time.time()
+        return data
+
+    def put(self, key, data):
+        """Store PNG bytes under `key`"""
+        blob_path = self._blob_path(key)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        with open(blob_path, 'wb') as f:
+            f.write(data)
+        self.blobs[key] = {'size': len(data), 'used': time.time()}
+
+    def record(self, path, key):
+        """Remember that `path` was just written from `key`"""
+        stat = os.stat(path)
+        self.outputs[path] = {'key': key, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def save(self):
+        """Evict least recently used blobs over the limit and write the manifest"""
+        total = sum(blob['size'] for blob in self.blobs.values())
+        for key in sorted(self.blobs, key=lambda key: self.blobs[key]['used']):
+            if total <= self.max_bytes:
+                break
+            total -= self.blobs.pop(key)['size']
+            try:
+                os.remove(self._blob_path(key))
+            except OSError:
+                pass
+
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'outputs': self.outputs, 'blobs': self.blobs}, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
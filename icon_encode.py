@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+PNG encoding profiles for the AEYE.NG icon generators
+dev trades size for speed, release searches for the smallest lossless file
+"""
+
+import io
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# Each profile lists the Pillow PNG options to try; the smallest result wins
+PROFILES = {
+    'dev': {
+        'candidates': [{'compress_level': 1}],
+        'palette_max': 0,
+        'strip_alpha': False,
+    },
+    'standard': {
+        'candidates': [{'optimize': True}],
+        'palette_max': 0,
+        'strip_alpha': False,
+    },
+    'release': {
+        'candidates': [
+            {'optimize': True},
+            {'compress_level': 9, 'compress_type': zlib.Z_FILTERED},
+            {'compress_level': 9, 'compress_type': zlib.Z_RLE},
+            {'compress_level': 6, 'compress_type': zlib.Z_DEFAULT_STRATEGY},
+        ],
+        # Try lossless palette output for icons up to this size
+        'palette_max': 64,
+        # Drop the alpha channel when every pixel is opaque
+        'strip_alpha': True,
+    },
+}
+
+
+def to_palette(icon):
+    """Return a lossless 'P' copy of an RGBA icon, or None if it has over 256 colors"""
+    colors = icon.getcolors(256)
+    if colors is None:
+        return None
+
+    index = {color: i for i, (_, color) in enumerate(colors)}
+    data = icon.tobytes()
+    pixels = bytes(index[tuple(data[i:i + 4])] for i in range(0, len(data), 4))
+
+    palette_image = Image.frombytes('P', icon.size, pixels)
+    palette_image.putpalette(bytes(channel for _, color in colors for channel in color[:3]))
+    alphas = bytes(color[3] for _, color in colors)
+    if any(alpha != 255 for alpha in alphas):
+        palette_image.info['transparency'] = alphas
+    return palette_image
+
+
+def _encode(image, options):
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', **options)
+    return buffer.getvalue()
+
+
+def encode_png(icon, profile='standard', save_options=None):
+    """Encode an icon with a named profile
+
+    `save_options` carries metadata such as dpi and is added to every
+    candidate. Returns (png_bytes, baseline_bytes), where the baseline is
+    the size of the first candidate so callers can report what the other
+    candidates saved.
+    """
+    settings = PROFILES[profile]
+    extra = save_options or {}
+
+    jobs = [(icon, {**options, **extra}) for options in settings['candidates']]
+    opaque = icon.mode == 'RGBA' and icon.getchannel('A').getextrema() == (255, 255)
+    if settings['strip_alpha'] and opaque:
+        jobs.append((icon.convert('RGB'), {'optimize': True, **extra}))
+    if max(icon.size) <= settings['palette_max']:
+        palette_image = to_palette(icon)
+        if palette_image is not None:
+            jobs.append((palette_image, {'optimize': True, **extra}))
+
+    if len(jobs) == 1:
+        data = _encode(*jobs[0])
+        return data, len(data)
+
+    # zlib releases the GIL, so candidates compress side by side
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        results = list(pool.map(lambda job: _encode(*job), jobs))
+
+    return min(results, key=len), len(results[0])
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+favicon.ico and browserconfig.xml assembly for the AEYE.NG icon generators
+Every ICO frame is rendered natively in memory; nothing is read back from disk
+"""
+
+import os
+import struct
+from xml.sax.saxutils import quoteattr
+
+from icon_cache import fingerprint
+from icon_encode import encode_png
+from icon_hashing import write_atomic
+from icon_profile import span
+
+FAVICON_SIZES = (16, 24, 32, 48, 64)
+
+
+def _bmp_frame(icon):
+    """Encode an RGBA icon as an ICO BMP frame: 32-bit BGRA plus the AND mask"""
+    width, height = icon.size
+    alpha = icon.getchannel('A')
+    # Legacy readers ignore alpha and use the 1-bit mask: set = transparent
+    mask = alpha.point(lambda a: 255 if a == 0 else 0).convert('1', dither=0)
+    mask_stride = (width + 31) // 32 * 4
+
+    # Height is doubled because the XOR (color) and AND (mask) bitmaps are stacked
+    header = struct.pack('<IiiHHIIiiII', 40, width, height * 2, 1, 32, 0, 0, 0, 0, 0, 0)
+    return (header + icon.tobytes('raw', ('BGRA', 0, -1))
+            + mask.tobytes('raw', ('1', mask_stride, -1)))
+
+
+def ico_bytes(frames, encoding='standard'):
+    """Pack RGBA frames into an ICO file, storing each as BMP or PNG, whichever is smaller"""
+    frames = sorted(frames, key=lambda frame: frame.width)
+    payloads = []
+    for frame in frames:
+        png, _ = encode_png(frame, encoding)
+        bmp = _bmp_frame(frame)
+        payloads.append(png if len(png) < len(bmp) else bmp)
+
+    directory = struct.pack('<HHH', 0, 1, len(frames))
+    offset = 6 + 16 * len(frames)
+    for frame, payload in zip(frames, payloads):
+        width, height = frame.size
+        # 0 stands for 256 in the one-byte size fields
+        directory += struct.pack('<BBBBHHII', width % 256, height % 256, 0, 0, 1, 32,
+                                 len(payload), offset)
+        offset += len(payload)
+
+    return directory + b''.join(payloads)
+
+
+def build_favicon(render, target, cache=None, renderer_key='', encoding='standard'):
+    """Render the favicon.ico frames natively and write `target['path']`
+
+    `target` is the favicon.ico entry from icon-spec.json; its `sizes` list
+    picks the frames (FAVICON_SIZES by default). Returns (path, status)
+    with the same statuses as icon_build.build_icons.
+    """
+    path = target['path']
+    sizes = tuple(target.get('sizes', FAVICON_SIZES))
+    key = fingerprint([__file__], renderer_key, 'favicon.ico', sizes, encoding)
+
+    if cache is not None:
+        if cache.is_fresh(path, key):
+            cache.hits += 1
+            return path, 'fresh'
+        data = cache.get(key)
+        if data is not None:
+            write_atomic(path, data)
+            cache.hits += 1
+            cache.record(path, key)
+            return path, 'hit'
+
+    with span('favicon', frames=len(sizes)):
+        data = ico_bytes([render(size, False) for size in sizes], encoding)
+    write_atomic(path, data)
+    if cache is not None:
+        cache.misses += 1
+        cache.put(key, data)
+        cache.record(path, key)
+    return path, 'miss'
+
+
+def browserconfig_xml(tiles, tile_color):
+    """Return browserconfig.xml for (element, url) tile pairs"""
+    lines = ['<?xml version="1.0" encoding="utf-8"?>',
+             '<browserconfig>',
+             '    <msapplication>',
+             '        <tile>']
+    lines += [f'            <{element} src={quoteattr(url)}/>' for element, url in tiles]
+    lines += [f'            <TileColor>{tile_color}</TileColor>',
+              '        </tile>',
+              '    </msapplication>',
+              '</browserconfig>',
+              '']
+    return '\n'.join(lines)
+
+
+def write_browserconfig(spec, target, names=None):
+    """Write browserconfig.xml for the spec's mstile icons; returns (path, changed)
+
+    Tile images are ordinary spec icons (purpose "mstile", with a `tile`
+    element name) so they are rendered in the same pass as every other size.
+    `names` maps icon filenames to the names to link instead (hashed mode).
+    """
+    names = names or {}
+    public = os.path.dirname(target['path'])
+    tiles = []
+    for icon in spec['icons']:
+        if icon['purpose'] == 'mstile':
+            filename = names.get(icon['filename'], icon['filename'])
+            url = '/' + os.path.relpath(os.path.join(spec['directory'], filename), public)
+            tiles.append((icon['tile'], url.replace(os.sep, '/')))
+
+    data = browserconfig_xml(tiles, target.get('tile_color', '#3B82F6')).encode()
+    try:
+        with open(target['path'], 'rb') as f:
+            if f.read() == data:
+                return target['path'], False
+    except OSError:
+        pass
+
+    write_atomic(target['path'], data)
+    return target['path'], True
+
+
+def build_derived(render, spec, selected=None, cache=None, renderer_key='', encoding='standard',
+                  names=None):
+    """Build favicon.ico and browserconfig.xml after the icon pass
+
+    Yields (name, path, status) for each derived target in `selected`
+    (all of them when None). Saves the cache when done. `names` is the
+    hashed filename map from icon_hashing.publish, if any.
+    """
+    targets = spec['targets']
+
+    if 'favicon.ico' in targets and (selected is None or 'favicon.ico' in selected):
+        path, status = build_favicon(render, targets['favicon.ico'], cache, renderer_key, encoding)
+        yield 'favicon.ico', path, status
+
+    if 'browserconfig.xml' in targets and (selected is None or 'browserconfig.xml' in selected):
+        path, changed = write_browserconfig(spec, targets['browserconfig.xml'], names)
+        yield 'browserconfig.xml', path, 'miss' if changed else 'fresh'
+
+    if cache is not None:
+        cache.save()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Font resolution for the AEYE.NG icon generators
+Finds a usable face once per process and memoizes loaded fonts per size
+
+Set AEYE_FONT_BOLD / AEYE_FONT_REGULAR to a font file to skip discovery.
+"""
+
+import os
+from functools import lru_cache
+from PIL import ImageFont
+
+from icon_profile import span
+
+# Standard places to look when none of a renderer's preferred paths exist
+FONT_DIRECTORIES = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+]
+
+# Known good faces by file name, best first
+KNOWN_FACES = {
+    'bold': [
+        "LiberationSans-Bold.ttf",
+        "Arial Bold.ttf",
+        "Arial_Bold.ttf",
+        "arialbd.ttf",
+        "DejaVuSans-Bold.ttf",
+        "NotoSans-Bold.ttf",
+        "FreeSansBold.ttf",
+        "Helvetica.ttc",
+    ],
+    'regular': [
+        "LiberationSans-Regular.ttf",
+        "LiberationSans.ttf",
+        "Arial.ttf",
+        "arial.ttf",
+        "DejaVuSans.ttf",
+        "NotoSans-Regular.ttf",
+        "FreeSans.ttf",
+        "Helvetica.ttc",
+    ],
+}
+
+
+class FontNotFoundError(RuntimeError):
+    """Raised when no usable font file can be found"""
+
+
+@lru_cache(maxsize=1)
+def _scan_font_directories():
+    """Walk the standard font directories once and index files by name"""
+    found = {}
+    for directory in FONT_DIRECTORIES:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                found.setdefault(name, os.path.join(root, name))
+    return found
+
+
+@lru_cache(maxsize=None)
+def _resolve(weight, preferred):
+    configured = os.environ.get(f'AEYE_FONT_{weight.upper()}')
+    if configured:
+        if not os.path.isfile(configured):
+            raise FontNotFoundError(f"AEYE_FONT_{weight.upper()} points to a missing file: {configured}")
+        return configured
+
+    for path in preferred:
+        if os.path.isfile(path):
+            return path
+
+    installed = _scan_font_directories()
+    for name in KNOWN_FACES[weight]:
+        if name in installed:
+            return installed[name]
+
+    raise FontNotFoundError(
+        f"No usable {weight} font found in {', '.join(FONT_DIRECTORIES)}; "
+        f"install one or set AEYE_FONT_{weight.upper()}=/path/to/font.ttf")
+
+
+def resolve_font(weight='bold', preferred=()):
+    """Return the font file to use for `weight` ('bold' or 'regular')
+
+    An AEYE_FONT_<WEIGHT> environment variable wins, then the first
+    existing path in `preferred`, then the best known face found in the
+    standard font directories. The answer is cached for the process.
+    """
+    return _resolve(weight, tuple(preferred))
+
+
+@lru_cache(maxsize=64)
+def load_font(path, size):
+    """Load a FreeTypeFont, reusing it for repeated (path, size) pairs"""
+    with span('font load', size):
+        return ImageFont.truetype(path, size)
+
+
+def describe_font(path):
+    """Human readable 'Family Style (path)' for progress output"""
+    family, style = load_font(path, 12).getname()
+    return f"{family} {style} ({path})"
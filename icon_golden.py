@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression check for the AEYE.NG icon renderers
+Diffs fresh renders of every spec icon against stored references in NumPy
+
+    python3 icon_golden.py --update          # store the current renders as references
+    python3 icon_golden.py                   # compare; exit 1 if any icon drifted
+
+Each icon reports the max and mean channel error, the number of changed
+pixels and the PSNR. Tolerances depend on the icon size (see TOLERANCES);
+a failing icon gets a heatmap of its per-pixel error in the diff directory.
+
+Both modes render with the DejaVu Sans faces in icon-golden/fonts (set
+through AEYE_FONT_BOLD / AEYE_FONT_REGULAR), not whichever system font
+icon_fonts would find, so the committed references hold on any machine.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+from icon_api import RENDERERS, renderer
+from icon_spec import icon_sizes, load_icon_spec
+
+try:
+    import numpy as np
+except ImportError:
+    # The comparison is written against NumPy arrays; main() reports it missing
+    np = None
+
+GOLDEN_DIR = 'icon-golden'
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), GOLDEN_DIR, 'fonts')
+GOLDEN_FONTS = {
+    'bold': os.path.join(FONT_DIR, 'DejaVuSans-Bold.ttf'),
+    'regular': os.path.join(FONT_DIR, 'DejaVuSans.ttf'),
+}
+
+# (largest size, limits) pairs, first match wins. Small icons get looser
+# limits because a one-pixel shift in a 16 px glyph moves a large share
+# of the pixels. changed_ratio is the share of pixels that differ at all.
+TOLERANCES = [
+    (64, {'max_error': 24, 'mean_error': 1.0, 'changed_ratio': 0.02, 'min_psnr': 35.0}),
+    (None, {'max_error': 16, 'mean_error': 0.5, 'changed_ratio': 0.01, 'min_psnr': 40.0}),
+]
+
+
+def tolerance_for(size, tolerances=TOLERANCES):
+    for limit, values in tolerances:
+        if limit is None or size <= limit:
+            return values
+    raise ValueError(f"No tolerance covers {size} px")
+
+
+def diff_images(reference, actual):
+    """Error statistics and the per-pixel max channel error between two RGBA arrays"""
+    if reference.shape != actual.shape:
+        return {'error': f"size {reference.shape[1]}x{reference.shape[0]} != "
+                         f"{actual.shape[1]}x{actual.shape[0]}"}, None
+
+    difference = np.abs(reference.astype(np.int16) - actual.astype(np.int16)).astype(np.uint8)
+    pixel_error = difference.max(axis=2)
+    mse = float(np.mean(np.square(difference, dtype=np.float32)))
+
+    return {
+        'max_error': int(pixel_error.max()),
+        'mean_error': float(difference.mean()),
+        'changed_pixels': int(np.count_nonzero(pixel_error)),
+        'changed_ratio': float(np.count_nonzero(pixel_error)) / pixel_error.size,
+        # None for identical images, whose PSNR is infinite
+        'psnr': None if mse == 0 else 10 * math.log10(255 ** 2 / mse),
+    }, pixel_error
+
+
+def failures(stats, limits):
+    """Messages for every limit `stats` breaks"""
+    if 'error' in stats:
+        return [stats['error']]
+    problems = []
+    for name in ('max_error', 'mean_error', 'changed_ratio'):
+        if stats[name] > limits[name]:
+            problems.append(f"{name} {stats[name]:.4g} > {limits[name]}")
+    if stats['psnr'] is not None and stats['psnr'] < limits['min_psnr']:
+        problems.append(f"psnr {stats['psnr']:.1f} dB < {limits['min_psnr']} dB")
+    return problems
+
+
+def heatmap(pixel_error):
+    """Black where identical, through red to yellow as the error grows"""
+    scaled = np.minimum(pixel_error.astype(np.uint16) * 4, 510)
+    rgb = np.zeros(pixel_error.shape + (3,), np.uint8)
+    rgb[..., 0] = np.minimum(scaled, 255)
+    rgb[..., 1] = np.maximum(scaled, 255) - 255
+    return Image.fromarray(rgb, 'RGB')
+
+
+def pin_fonts():
+    """Make the renderers use GOLDEN_FONTS
+
+    Renderers keep the font they resolved first, so this has to run before
+    anything in the process renders; check_golden and update_golden call it.
+    """
+    for weight, path in GOLDEN_FONTS.items():
+        os.environ[f'AEYE_FONT_{weight.upper()}'] = path
+
+
+def golden_path(directory, style, filename):
+    return os.path.join(directory, style, filename)
+
+
+def check_icon(style, size, filename, maskable, directory, diff_directory, tolerances):
+    """Compare one fresh render with its reference; returns a result dict"""
+    result = {'style': style, 'filename': filename, 'size': size, 'maskable': maskable}
+    actual = renderer(style)(size, maskable)
+    try:
+        with Image.open(golden_path(directory, style, filename)) as reference:
+            expected = np.asarray(reference.convert('RGBA'))
+    except OSError:
+        result.update(status='missing', problems=['no reference image'])
+        return result
+
+    stats, pixel_error = diff_images(expected, np.asarray(actual.convert('RGBA')))
+    problems = failures(stats, tolerance_for(size, tolerances))
+    result.update(stats, status='fail' if problems else 'pass', problems=problems)
+
+    if problems and pixel_error is not None:
+        path = golden_path(diff_directory, style, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        heatmap(pixel_error).save(path, compress_level=1)
+        result['heatmap'] = path
+    return result
+
+
+def spec_icons(styles):
+    spec = load_icon_spec()
+    return [(style, size, filename, maskable)
+            for style in styles for size, filename, maskable in icon_sizes(spec, style)]
+
+
+def remove_heatmaps(diff_directory, icons):
+    """Delete the heatmaps an earlier run may have left for `icons`, and emptied style folders"""
+    for style, _, filename, _ in icons:
+        path = golden_path(diff_directory, style, filename)
+        if os.path.isfile(path):
+            os.remove(path)
+    for style in {icon[0] for icon in icons}:
+        try:
+            os.rmdir(os.path.join(diff_directory, style))
+        except OSError:
+            # Missing, or still holds files this tool did not write
+            pass
+
+
+def check_golden(styles=tuple(RENDERERS), directory=GOLDEN_DIR, diff_directory=None,
+                 tolerances=TOLERANCES, jobs=8):
+    """Compare every spec icon of `styles`; returns the results in spec order
+
+    Stale heatmaps from an earlier run are removed first, so the diff
+    directory only ever holds the current failures. Only the heatmap paths
+    this tool writes (<diff>/<style>/<filename>) are touched, so pointing
+    it at a directory with other files in it is safe.
+    """
+    pin_fonts()
+    diff_directory = diff_directory or os.path.join(directory, 'diff')
+    icons = spec_icons(styles)
+    remove_heatmaps(diff_directory, icons)
+
+    # Pillow and NumPy release the GIL for decoding, drawing and the diff
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        return list(pool.map(lambda icon: check_icon(*icon, directory, diff_directory, tolerances),
+                             icons))
+
+
+def update_golden(styles=tuple(RENDERERS), directory=GOLDEN_DIR):
+    """Store fresh renders of every spec icon as the references; returns their paths"""
+    pin_fonts()
+    paths = []
+    for style, size, filename, maskable in spec_icons(styles):
+        path = golden_path(directory, style, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        renderer(style)(size, maskable).save(path, optimize=True)
+        paths.append(path)
+    return paths
+
+
+def load_tolerances(path=None):
+    """TOLERANCES, or a JSON list of [largest size or null, limits] pairs"""
+    if not path:
+        return TOLERANCES
+    with open(path, 'r') as f:
+        return [(limit, {**TOLERANCES[-1][1], **values}) for limit, values in json.load(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fresh icon renders with golden references")
+    parser.add_argument('--styles', nargs='+', choices=sorted(RENDERERS), default=sorted(RENDERERS))
+    parser.add_argument('--directory', default=GOLDEN_DIR,
+                        help="reference image directory")
+    parser.add_argument('--diff-directory',
+                        help="where failing icons' heatmaps go (default: <directory>/diff)")
+    parser.add_argument('--tolerances', metavar='PATH',
+                        help='JSON list of [max size or null, {"max_error": ..., "min_psnr": ...}] pairs')
+    parser.add_argument('--update', action='store_true',
+                        help="store the current renders as the new references")
+    parser.add_argument('--json', action='store_true',
+                        help="print the results as JSON")
+    parser.add_argument('--jobs', type=int, default=min(8, os.cpu_count() or 1),
+                        help="worker threads (0 = one per core)")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error(f"--jobs must be 0 (one per core) or a positive number of threads, got {args.jobs}")
+
+    if args.update:
+        paths = update_golden(args.styles, args.directory)
+        print(f"📸 Stored {len(paths)} reference renders in {args.directory}/")
+        return 0
+
+    if np is None:
+        parser.error("the golden-image diff needs NumPy (pip install numpy)")
+
+    start = time.perf_counter()
+    results = check_golden(args.styles, args.directory, args.diff_directory,
+                           load_tolerances(args.tolerances), args.jobs)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            name = f"{result['style']}/{result['filename']}"
+            if result['status'] == 'pass':
+                psnr = '∞' if result['psnr'] is None else f"{result['psnr']:.1f}"
+                print(f"✅ {name:<42} max {result['max_error']:>3}  mean {result['mean_error']:.3f}  "
+                      f"changed {result['changed_pixels']:>6}  PSNR {psnr} dB")
+            else:
+                print(f"❌ {name:<42} {'; '.join(result['problems'])}")
+                if 'heatmap' in result:
+                    print(f"   🔥 Heatmap: {result['heatmap']}")
+
+    failed = [result for result in results if result['status'] != 'pass']
+    print(f"{'❌' if failed else '✅'} {len(results) - len(failed)}/{len(results)} icons match "
+          f"their references ({elapsed * 1000:.0f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Fast gradient fills for the AEYE.NG icon generators
+Builds whole gradient images from a one-pixel color strip instead of drawing pixel by pixel
+"""
+
+import math
+import sys
+import time
+from array import array
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageMath
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy only speeds up the radial distance field
+    np = None
+
+
+def _normalize_stops(colors):
+    """Turn a list of RGB colors into a hashable tuple of int triples"""
+    stops = tuple(tuple(int(c) for c in color[:3]) for color in colors)
+    if len(stops) < 2:
+        raise ValueError("A gradient needs at least 2 color stops")
+    return stops
+
+
+@lru_cache(maxsize=64)
+def gradient_row_table(height, stops):
+    """Return the RGBA bytes for one pixel per row of an evenly spaced gradient"""
+    segments = len(stops) - 1
+    table = bytearray(height * 4)
+
+    for y in range(height):
+        # Position along the whole gradient, then within the current segment
+        position = (y / height) * segments
+        index = min(int(position), segments - 1)
+        t = position - index
+
+        start, end = stops[index], stops[index + 1]
+        table[y * 4:y * 4 + 4] = bytes((
+            int(start[0] * (1-t) + end[0] * t),
+            int(start[1] * (1-t) + end[1] * t),
+            int(start[2] * (1-t) + end[2] * t),
+            255,
+        ))
+
+    return bytes(table)
+
+
+def linear_gradient(width, height, colors):
+    """Create a vertical RGBA gradient through any number of color stops"""
+    table = gradient_row_table(height, _normalize_stops(colors))
+
+    # One pixel wide strip, stretched sideways without interpolation
+    strip = Image.frombytes('RGBA', (1, height), table)
+    return strip.resize((width, height), Image.NEAREST)
+
+
+@lru_cache(maxsize=64)
+def gradient_lut(stops, steps=256):
+    """Return one channel lookup table per RGB component for evenly spaced stops"""
+    segments = len(stops) - 1
+    luts = ([], [], [])
+
+    for i in range(steps):
+        position = (i / (steps - 1)) * segments
+        index = min(int(position), segments - 1)
+        t = position - index
+
+        start, end = stops[index], stops[index + 1]
+        for channel in range(3):
+            luts[channel].append(int(start[channel] * (1-t) + end[channel] * t))
+
+    return luts
+
+
+def _squared_offsets(length, center, scale):
+    """Return a float image row holding ((i - center) * scale) ** 2 per pixel"""
+    values = array('f', (((i - center) * scale) ** 2 for i in range(length)))
+    return Image.frombytes('F', (length, 1), values.tobytes())
+
+
+def _square_root(dx, dy):
+    """Evaluate sqrt(dx + dy) across two float images in one C pass"""
+    if hasattr(ImageMath, 'lambda_eval'):
+        return ImageMath.lambda_eval(lambda args: (args['dx'] + args['dy']) ** 0.5, dx=dx, dy=dy)
+    # Fallback for older Pillow versions
+    return ImageMath.eval("(dx + dy) ** 0.5", dx=dx, dy=dy)
+
+
+def distance_field(width, height, center_x, center_y, scale):
+    """Return an 'L' image of each pixel's distance from the center times scale, clipped at 255"""
+    if np is not None:
+        xs = (np.arange(width, dtype=np.float32) - center_x) * np.float32(scale)
+        ys = (np.arange(height, dtype=np.float32) - center_y) * np.float32(scale)
+        distance = xs[None, :] ** 2 + ys[:, None] ** 2
+        np.sqrt(distance, out=distance)
+        np.minimum(distance, 255, out=distance)
+        return Image.fromarray(distance.astype(np.uint8), 'L')
+
+    # Pure Pillow path: broadcast the squared offsets, then one sqrt pass
+    dx = _squared_offsets(width, center_x, scale).resize((width, height), Image.NEAREST)
+    dy = _squared_offsets(height, center_y, scale).transpose(Image.TRANSPOSE)
+    dy = dy.resize((width, height), Image.NEAREST)
+    return _square_root(dx, dy).convert('L')
+
+
+def radial_gradient(width, height, colors, center=None, radius=None, fill=True):
+    """Create an RGBA radial gradient from the center stop outwards
+
+    Colors are evenly spaced from the center (first stop) to `radius`
+    (last stop). With fill=True everything past the radius keeps the last
+    color, otherwise it stays transparent.
+    """
+    stops = _normalize_stops(colors)
+    center_x, center_y = center if center is not None else (width / 2, height / 2)
+
+    if radius is None:
+        # Reach the furthest corner so the whole canvas is covered
+        radius = max(math.hypot(x - center_x, y - center_y)
+                     for x in (0, width) for y in (0, height))
+    radius = max(radius, 1e-6)
+
+    # Normalized distance field, scaled so the radius lands on index 255
+    distance = distance_field(width, height, center_x, center_y, 255 / radius)
+
+    # Use the distance as a palette index so one conversion applies the LUT
+    red, green, blue = gradient_lut(stops)
+    distance.putpalette(bytes(value for rgb in zip(red, green, blue) for value in rgb))
+    image = distance.convert('RGBA')
+
+    if not fill:
+        alpha = Image.new('L', (width, height), 0)
+        ImageDraw.Draw(alpha).ellipse([center_x - radius, center_y - radius,
+                                       center_x + radius, center_y + radius], fill=255)
+        image.putalpha(alpha)
+
+    return image
+
+
+def _ellipse_stack_gradient(width, height, bounds_check=True):
+    """Original concentric-ellipse background, kept for the benchmark"""
+    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+
+    center_x, center_y = width // 2, height // 3
+    max_radius = int(math.sqrt(width**2 + height**2) * 0.7)
+
+    for i in range(max_radius, 0, -2):
+        progress = 1 - (i / max_radius)
+
+        r = int(26 + (15 - 26) * progress)
+        g = int(54 + (23 - 54) * progress)
+        b = int(93 + (42 - 93) * progress)
+
+        left = center_x - i
+        top = center_y - i
+        right = center_x + i
+        bottom = center_y + i
+
+        if not bounds_check or (left >= 0 and top >= 0 and right < width and bottom < height):
+            draw.ellipse([left, top, right, bottom], fill=(r, g, b, 255))
+
+    return image
+
+
+def _putpixel_gradient(width, height, colors):
+    """Original 3-stop per-pixel implementation, kept for the benchmark"""
+    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+
+    for y in range(height):
+        progress = y / height
+
+        if progress < 0.5:
+            t = progress * 2
+            r = int(colors[0][0] * (1-t) + colors[1][0] * t)
+            g = int(colors[0][1] * (1-t) + colors[1][1] * t)
+            b = int(colors[0][2] * (1-t) + colors[1][2] * t)
+        else:
+            t = (progress - 0.5) * 2
+            r = int(colors[1][0] * (1-t) + colors[2][0] * t)
+            g = int(colors[1][1] * (1-t) + colors[2][1] * t)
+            b = int(colors[1][2] * (1-t) + colors[2][2] * t)
+
+        for x in range(width):
+            image.putpixel((x, y), (r, g, b, 255))
+
+    return image
+
+
+# How far create_gradient_background's default (clipped disc) output may
+# drift from the original ellipse stack: (largest size, max colour levels
+# on pixels both cover, share of pixels whose coverage differs). Both cover
+# exactly the same pixels; the colours differ most on small icons because
+# the stack truncated each 2 px ring to a flat colour, and agree to one
+# level above 128 px.
+RADIAL_TOLERANCES = [(15, 12, 0.0), (32, 6, 0.0), (48, 3, 0.0), (128, 2, 0.0), (None, 1, 0.0)]
+
+
+def compare_radial_background(size):
+    """(max colour level difference, share of pixels with different coverage) against the stack"""
+    from create_perfect_icons import create_gradient_background
+
+    old = _ellipse_stack_gradient(size, size).tobytes()
+    new = create_gradient_background(size, size).tobytes()
+    levels = coverage = 0
+    for i in range(0, len(old), 4):
+        if (old[i + 3] > 0) != (new[i + 3] > 0):
+            coverage += 1
+        elif old[i + 3]:
+            levels = max(levels, *(abs(old[i + c] - new[i + c]) for c in range(3)))
+    return levels, coverage / (size * size)
+
+
+def check_radial_equivalence(sizes=(16, 24, 32, 48, 64, 72, 96, 128, 192, 256, 512, 1024)):
+    """Print each size's drift from the ellipse stack; returns False if any is out of tolerance"""
+    print("🔍 Radial background vs ellipse stack (levels, coverage)")
+    ok = True
+    for size in sizes:
+        levels, coverage = compare_radial_background(size)
+        limit_levels, limit_coverage = next(
+            (levels, coverage) for limit, levels, coverage in RADIAL_TOLERANCES
+            if limit is None or size <= limit)
+        within = levels <= limit_levels and coverage <= limit_coverage
+        ok = ok and within
+        print(f"  {size:>5}px  max {levels} levels (≤ {limit_levels})  "
+              f"coverage differs on {coverage:.2%} (≤ {limit_coverage:.0%}) {'✅' if within else '❌'}")
+    return ok
+
+
+def benchmark_gradients(sizes=(16, 32, 64, 128, 256, 512, 1024, 2048, 4096)):
+    """Compare the strip gradient against the per-pixel loop"""
+    colors = [(59, 130, 246), (37, 99, 235), (30, 64, 175)]
+
+    print("⏱️  Gradient benchmark (putpixel vs strip)")
+    for size in sizes:
+        start = time.perf_counter()
+        slow = _putpixel_gradient(size, size, colors)
+        slow_time = time.perf_counter() - start
+
+        gradient_row_table.cache_clear()
+        start = time.perf_counter()
+        fast = linear_gradient(size, size, colors)
+        fast_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        linear_gradient(size, size, colors)
+        cached_time = time.perf_counter() - start
+
+        same = slow.tobytes() == fast.tobytes()
+        speedup = slow_time / max(fast_time, 1e-9)
+        print(f"  {size:>5}px  putpixel {slow_time * 1000:9.2f} ms  "
+              f"strip {fast_time * 1000:7.3f} ms  cached {cached_time * 1000:7.3f} ms  "
+              f"x{speedup:,.0f} {'✅' if same else '❌ pixels differ'}")
+
+
+def benchmark_radial_gradients(sizes=(16, 32, 64, 128, 256, 512, 1024, 2048)):
+    """Compare the distance-field radial gradient against the ellipse stack"""
+    colors = [(15, 23, 42), (26, 54, 93)]
+
+    print("⏱️  Radial gradient benchmark (ellipse stack vs distance field)")
+    for size in sizes:
+        center = (size // 2, size // 3)
+        radius = int(math.sqrt(2 * size**2) * 0.7)
+
+        start = time.perf_counter()
+        _ellipse_stack_gradient(size, size, bounds_check=False)
+        stack_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        radial_gradient(size, size, colors, center=center, radius=radius)
+        field_time = time.perf_counter() - start
+
+        speedup = stack_time / max(field_time, 1e-9)
+        print(f"  {size:>5}px  ellipses {stack_time * 1000:9.2f} ms  "
+              f"distance field {field_time * 1000:7.3f} ms  x{speedup:,.1f}")
+
+
+if __name__ == "__main__":
+    benchmark_gradients()
+    print()
+    benchmark_radial_gradients()
+    print()
+    sys.exit(0 if check_radial_equivalence() else 1)
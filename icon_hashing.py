@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Content-hashed icon filenames for the AEYE.NG icon generators
+Publishes icon-192x192.<hash>.png copies next to the stable names so they
+can be served with long immutable cache lifetimes, and points
+manifest.json and layout.tsx at them
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+
+HASH_LENGTH = 8
+
+
+def hashed_filename(filename, data):
+    """icon-192x192.png -> icon-192x192.<sha256 prefix>.png; same bytes, same name"""
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{extension}"
+
+
+def _hashed_pattern(filename):
+    """Regex matching `filename` with or without a content hash"""
+    stem, extension = os.path.splitext(filename)
+    return re.escape(stem) + r'(?:\.[0-9a-f]{%d})?' % HASH_LENGTH + re.escape(extension)
+
+
+def write_atomic(path, data):
+    """Write bytes or text through a temporary file and rename it into place
+
+    Creates the parent directory if needed.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb' if isinstance(data, bytes) else 'w') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def public_url(spec, filename):
+    """URL an icon file is served at, e.g. /icons/icon-192x192.png"""
+    public = os.path.dirname(spec['manifest'])
+    return '/' + os.path.relpath(os.path.join(spec['directory'], filename), public).replace(os.sep, '/')
+
+
+def publish_hashed(spec, keep=3):
+    """Write a content-hashed copy of every built icon and prune old copies
+
+    Returns {filename: hashed_filename} for the icons present on disk. An
+    unchanged icon keeps its hashed name and file; its mtime is refreshed
+    so retention counts it as current. For each icon the `keep` most
+    recently published hashed copies survive and older ones are deleted.
+    """
+    names = {}
+    pruned = []
+
+    for icon in spec['icons']:
+        filename = icon['filename']
+        path = os.path.join(spec['directory'], filename)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+
+        hashed = hashed_filename(filename, data)
+        hashed_path = os.path.join(spec['directory'], hashed)
+        if os.path.exists(hashed_path):
+            os.utime(hashed_path)
+        else:
+            write_atomic(hashed_path, data)
+        names[filename] = hashed
+
+        stem, extension = os.path.splitext(filename)
+        pattern = re.compile(re.escape(stem) + r'\.[0-9a-f]{%d}' % HASH_LENGTH + re.escape(extension))
+        copies = [candidate for candidate in glob.glob(os.path.join(spec['directory'], f'{stem}.*{extension}'))
+                  if pattern.fullmatch(os.path.basename(candidate))]
+        copies.sort(key=lambda candidate: (candidate != hashed_path, -os.stat(candidate).st_mtime_ns))
+        for old in copies[max(1, keep):]:
+            os.remove(old)
+            pruned.append(old)
+
+    return names, pruned
+
+
+def rewrite_manifest(spec, names):
+    """Point the manifest's icon srcs at the hashed names; returns True if it changed"""
+    path = spec['manifest']
+    try:
+        with open(path, 'r') as f:
+            text = f.read()
+    except OSError:
+        return False
+
+    manifest = json.loads(text)
+    changed = False
+    for entry in manifest.get('icons', []):
+        src = entry.get('src', '')
+        for filename, hashed in names.items():
+            if re.fullmatch(_hashed_pattern(filename), os.path.basename(src)):
+                new_src = src[:len(src) - len(os.path.basename(src))] + hashed
+                changed = changed or new_src != src
+                entry['src'] = new_src
+                break
+
+    if changed:
+        write_atomic(path, json.dumps(manifest, indent=2) + '\n')
+    return changed
+
+
+def rewrite_links(path, spec, names):
+    """Rewrite /icons/... references in a source file such as layout.tsx
+
+    Both stable and previously hashed names are replaced, so repeated
+    builds keep the file pointing at the current copies. Returns True if
+    the file changed.
+    """
+    try:
+        with open(path, 'r') as f:
+            text = f.read()
+    except OSError:
+        return False
+
+    updated = text
+    for filename, hashed in names.items():
+        directory_url = public_url(spec, filename)[:-len(filename)]
+        pattern = re.escape(directory_url) + _hashed_pattern(filename) + r'(?![\w.-])'
+        updated = re.sub(pattern, lambda _: directory_url + hashed, updated)
+
+    if updated == text:
+        return False
+    write_atomic(path, updated)
+    return True
+
+
+def publish(spec, keep=3):
+    """Hash the icons, prune old copies and rewrite every file that links to them
+
+    Returns (names, pruned, rewritten) where `rewritten` lists the files
+    whose links changed.
+    """
+    names, pruned = publish_hashed(spec, keep)
+    return names, pruned, _rewrite_all(spec, names)
+
+
+def restore_links(spec):
+    """Point manifest.json and the pages back at the stable icon names
+
+    A build without hashing writes browserconfig.xml with the stable
+    names, so it calls this to make every file that links icons agree
+    again. Returns the files whose links changed (none if never hashed).
+    """
+    return _rewrite_all(spec, {icon['filename']: icon['filename'] for icon in spec['icons']})
+
+
+def _rewrite_all(spec, names):
+    rewritten = []
+    if rewrite_manifest(spec, names):
+        rewritten.append(spec['manifest'])
+    for page in spec['pages']:
+        if rewrite_links(page, spec, names):
+            rewritten.append(page)
+    return rewritten
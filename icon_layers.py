@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Sprite helpers for the AEYE.NG icon generators
+Visual elements are drawn once into small RGBA layers and then composited
+"""
+
+from PIL import Image, ImageDraw
+
+from icon_profile import span
+
+
+def draw_over(layer, paint, offset=(0, 0)):
+    """Paint with ImageDraw on a scratch layer and alpha-composite it onto `layer`
+
+    ImageDraw replaces RGBA pixels instead of blending them, so translucent
+    shapes drawn on top of others go through here to keep proper "over"
+    compositing inside a sprite.
+    """
+    scratch = Image.new('RGBA', layer.size, (0, 0, 0, 0))
+    paint(ImageDraw.Draw(scratch))
+    layer.alpha_composite(scratch, offset)
+
+
+def composite(image, layer, position):
+    """Alpha-composite `layer` onto `image` at `position`, clipping at the edges"""
+    x, y = position
+    left, top = max(0, -x), max(0, -y)
+    right = min(layer.width, image.width - x)
+    bottom = min(layer.height, image.height - y)
+    if right <= left or bottom <= top:
+        return
+
+    if (left, top, right, bottom) != (0, 0, layer.width, layer.height):
+        layer = layer.crop((left, top, right, bottom))
+    image.alpha_composite(layer, (x + left, y + top))
+
+
+def text_layer(text, font, fill, shadow=None, stroke=None):
+    """Render text into its own tightly cropped RGBA layer
+
+    `shadow` is an optional (color, (dx, dy)) drop shadow and `stroke` an
+    optional (width, color) outline drawn in the same pass as the text.
+    Returns (layer, (dx, dy)): composite the layer at the point the text
+    would have been drawn at, moved by (dx, dy).
+    """
+    stroke_width, stroke_fill = stroke or (0, None)
+    shadow_fill, (shadow_x, shadow_y) = shadow or (None, (0, 0))
+
+    left, top, right, bottom = font.getbbox(text, stroke_width=stroke_width)
+    origin = (max(0, -shadow_x) - left, max(0, -shadow_y) - top)
+    size = (right - left + abs(shadow_x), bottom - top + abs(shadow_y))
+    layer = Image.new('RGBA', (max(1, size[0]), max(1, size[1])), (0, 0, 0, 0))
+
+    if shadow_fill is not None:
+        with span('text shadow', font.size):
+            ImageDraw.Draw(layer).text((origin[0] + shadow_x, origin[1] + shadow_y), text,
+                                       fill=shadow_fill, font=font)
+        with span('text', font.size, outline=stroke_width):
+            draw_over(layer, lambda draw: draw.text(origin, text, fill=fill, font=font,
+                                                    stroke_width=stroke_width,
+                                                    stroke_fill=stroke_fill))
+    else:
+        with span('text', font.size, outline=stroke_width):
+            ImageDraw.Draw(layer).text(origin, text, fill=fill, font=font,
+                                       stroke_width=stroke_width, stroke_fill=stroke_fill)
+
+    return layer, (-origin[0], -origin[1])
+
+
+def text_width(font, text):
+    """Width of `text` as drawn with `font`"""
+    try:
+        left, _, right, _ = font.getbbox(text)
+        return right - left
+    except AttributeError:
+        # Fallback for older Pillow versions
+        return font.getsize(text)[0]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Per-stage profiling spans for the AEYE.NG icon pipeline
+Spans are free when profiling is off and record a Chrome trace when it is on
+
+    python3 create_professional_logo.py --profile                 # icon-profile.json
+    AEYE_PROFILE=trace.json python3 create_perfect_icons.py
+    python3 create_professional_logo.py --profile --cprofile      # + icon-profile.prof
+
+Open the trace in chrome://tracing or https://ui.perfetto.dev. The summary
+aggregates every stage per icon size; self time excludes nested spans.
+With cProfile on, each stage gets its own profiler that only runs while
+that stage is the innermost span, and the hottest stage's stats are dumped.
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import time
+
+PROFILE_ENV = 'AEYE_PROFILE'
+DEFAULT_TRACE = 'icon-profile.json'
+
+_NULL_SPAN = contextlib.nullcontext()
+_profiler = None
+
+
+def span(name, size=None, **args):
+    """Context manager timing one stage; a shared no-op when profiling is off"""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _Span(_profiler, name, size, args)
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'size', 'args', 'start', 'children')
+
+    def __init__(self, profiler, name, size, args):
+        self.profiler = profiler
+        self.name = name
+        self.size = size
+        self.args = args
+        self.children = 0
+
+    def __enter__(self):
+        self.profiler._push(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter_ns() - self.start
+        self.profiler._pop(self, duration)
+        return False
+
+
+class Profiler:
+    """Collects finished spans per thread and turns them into a trace and a summary"""
+
+    def __init__(self, cprofile=False):
+        self.origin = time.perf_counter_ns()
+        self.events = []
+        self.cprofile = cprofile
+        self.profiles = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _profiling(self):
+        return self.cprofile and threading.current_thread() is threading.main_thread()
+
+    def _push(self, current):
+        stack = self._stack()
+        if self._profiling():
+            if stack:
+                self.profiles[stack[-1].name].disable()
+            self.profiles.setdefault(current.name, cProfile.Profile()).enable()
+        stack.append(current)
+
+    def _pop(self, current, duration):
+        stack = self._stack()
+        stack.pop()
+        if self._profiling():
+            self.profiles[current.name].disable()
+            if stack:
+                self.profiles[stack[-1].name].enable()
+        if stack:
+            stack[-1].children += duration
+
+        event = (current.name, current.size, current.start - self.origin, duration,
+                 duration - current.children, threading.get_ident(), current.args)
+        with self._lock:
+            self.events.append(event)
+
+    def trace(self):
+        """Chrome trace-event JSON object with one complete ('X') event per span"""
+        pid = os.getpid()
+        events = []
+        for name, size, start, duration, _, thread, args in self.events:
+            args = dict(args, size=size) if size is not None else dict(args)
+            events.append({'name': name, 'cat': 'icon', 'ph': 'X', 'pid': pid, 'tid': thread,
+                           'ts': start / 1000, 'dur': duration / 1000,
+                           'args': {key: repr(value) if not isinstance(value, (int, float, str, bool))
+                                    else value for key, value in args.items()}})
+        return {'traceEvents': sorted(events, key=lambda event: event['ts']),
+                'displayTimeUnit': 'ms'}
+
+    def summary(self):
+        """{(stage, size): {'calls', 'total_ns', 'self_ns', 'max_ns'}}"""
+        rows = {}
+        for name, size, _, duration, own, _, _ in self.events:
+            row = rows.setdefault((name, size), {'calls': 0, 'total_ns': 0, 'self_ns': 0, 'max_ns': 0})
+            row['calls'] += 1
+            row['total_ns'] += duration
+            row['self_ns'] += own
+            row['max_ns'] = max(row['max_ns'], duration)
+        return rows
+
+    def hottest(self):
+        """Stage with the most self time, or None before any span finished"""
+        totals = {}
+        for name, _, _, _, own, _, _ in self.events:
+            totals[name] = totals.get(name, 0) + own
+        return max(totals, key=totals.get) if totals else None
+
+
+def format_summary(rows):
+    """Table of the summary rows: each stage's total, then its sizes, most self time first"""
+    stages = {}
+    for (name, _), row in rows.items():
+        total = stages.setdefault(name, {'calls': 0, 'total_ns': 0, 'self_ns': 0, 'max_ns': 0})
+        for key in ('calls', 'total_ns', 'self_ns'):
+            total[key] += row[key]
+        total['max_ns'] = max(total['max_ns'], row['max_ns'])
+
+    def line(name, size, row):
+        return (f"   {name:<16} {size:>6} {row['calls']:>6} {row['total_ns'] / 1e6:>10.2f} "
+                f"{row['self_ns'] / 1e6:>10.2f} {row['max_ns'] / 1e6:>9.2f}")
+
+    lines = [f"   {'stage':<16} {'size':>6} {'calls':>6} {'total ms':>10} {'self ms':>10} {'max ms':>9}"]
+    for name in sorted(stages, key=lambda name: -stages[name]['self_ns']):
+        lines.append(line(name, 'all', stages[name]))
+        sizes = sorted(size for stage, size in rows if stage == name and size is not None)
+        lines += [line('', size, rows[(name, size)]) for size in sizes]
+    return "\n".join(lines)
+
+
+def start_profiling(path=None, cprofile=False):
+    """Turn profiling on for a --profile/--cprofile run, or when AEYE_PROFILE is set
+
+    Returns (profiler, trace_path), or (None, None) when profiling stays off.
+    """
+    global _profiler
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path and not cprofile:
+        return None, None
+    if path in (None, '1', 'true', 'yes'):
+        path = DEFAULT_TRACE
+
+    _profiler = Profiler(cprofile)
+    return _profiler, path
+
+
+def finish_profiling(profiler, path):
+    """Turn profiling off, write the trace (and cProfile stats) and print the summary"""
+    global _profiler
+    if profiler is None:
+        return
+    _profiler = None
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(profiler.trace(), f)
+    os.replace(temp_path, path)
+
+    print(f"⏱️  Profile: {len(profiler.events)} spans")
+    print(format_summary(profiler.summary()))
+    print(f"🧭 Chrome trace: {path}")
+
+    hottest = profiler.hottest()
+    if profiler.cprofile and hottest is not None:
+        stats_path = os.path.splitext(path)[0] + '.prof'
+        profiler.profiles[hottest].dump_stats(stats_path)
+        print(f"🔥 cProfile of the hottest stage ({hottest}): {stats_path}")
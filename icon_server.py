@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+On-demand icon server for the AEYE.NG renderers
+Serves any size and variant from icon_api over stdlib HTTP, with ETags and Cache-Control
+
+    python3 icon_server.py --port 8765
+    curl -i http://localhost:8765/icons/professional/192.png
+    curl -i http://localhost:8765/icons/aeye/512-maskable.webp
+
+GET /stats returns the render cache counters as JSON.
+"""
+
+import argparse
+import json
+import re
+import sys
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from icon_api import RenderCache, get_icon
+from icon_encode import PROFILES
+
+ICON_PATH = re.compile(r'/icons/(?P<style>[\w-]+)/(?P<size>\d+)(?P<maskable>-maskable)?\.(?P<format>\w+)')
+
+
+def etag_matches(header, etag):
+    """True when an If-None-Match header value matches `etag` (weak comparison)"""
+    if header.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in header.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+class IconRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'AEYEIconServer/1.0'
+
+    def __init__(self, *args, cache=None, max_age=86400, encoding='standard', quiet=False, **kwargs):
+        self.cache = cache
+        self.max_age = max_age
+        self.encoding = encoding
+        self.quiet = quiet
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        path = self.path.split('?', 1)[0]
+        if path == '/stats':
+            body = (json.dumps(self.cache.stats(), indent=2) + '\n').encode()
+            self._send(HTTPStatus.OK, body if send_body else b'', 'application/json', len(body))
+            return
+
+        match = ICON_PATH.fullmatch(path)
+        if not match:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            icon = get_icon(int(match['size']), bool(match['maskable']), match['style'],
+                            match['format'], self.encoding, self.cache)
+        except ValueError as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        headers = {'ETag': icon.etag, 'Cache-Control': f'public, max-age={self.max_age}'}
+        if etag_matches(self.headers.get('If-None-Match', ''), icon.etag):
+            self._send(HTTPStatus.NOT_MODIFIED, b'', headers=headers)
+            return
+        self._send(HTTPStatus.OK, icon.data if send_body else b'', icon.content_type,
+                   len(icon.data), headers)
+
+    def _send(self, status, body, content_type=None, length=None, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Length', str(len(body) if length is None else length))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host='127.0.0.1', port=8765, cache=None, max_age=86400, encoding='standard',
+                quiet=False):
+    """A ThreadingHTTPServer serving icons from `cache` (a new RenderCache by default)"""
+    cache = RenderCache() if cache is None else cache
+    handler = partial(IconRequestHandler, cache=cache, max_age=max_age, encoding=encoding, quiet=quiet)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve AEYE.NG icons rendered on demand")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cache-size', type=int, default=32,
+                        help="render cache limit in MB")
+    parser.add_argument('--max-age', type=int, default=86400,
+                        help="Cache-Control max-age in seconds")
+    parser.add_argument('--encoding', choices=sorted(PROFILES), default='standard',
+                        help="PNG encoding profile")
+    parser.add_argument('--quiet', action='store_true',
+                        help="do not log every request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, RenderCache(args.cache_size * 1024 * 1024),
+                         args.max_age, args.encoding, args.quiet)
+    print(f"🌐 Serving icons on http://{args.host}:{server.server_port}/icons/<style>/<size>[-maskable].<format>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Shared icon spec for the AEYE.NG icon generators
+icon-spec.json is the one place that lists every icon size and derived file
+
+Each icon entry has size, filename, maskable and purpose, plus an optional
+style ("aeye" or "professional") that limits it to one renderer; mstile
+icons also name their browserconfig.xml element in `tile`. Derived targets
+such as favicon.ico and browserconfig.xml declare the icons they depend on.
+`manifest` and `pages` name the files whose icon links --hashed rewrites.
+
+    python3 icon_spec.py --list      # size:filename lines for the shell scripts
+"""
+
+import argparse
+import json
+import os
+from fnmatch import fnmatch
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icon-spec.json')
+
+
+def load_icon_spec(path=SPEC_PATH):
+    """Load and check the icon spec"""
+    with open(path, 'r') as f:
+        spec = json.load(f)
+
+    spec.setdefault('directory', 'public/icons')
+    spec.setdefault('manifest', 'public/manifest.json')
+    spec.setdefault('pages', [])
+    spec.setdefault('targets', {})
+
+    filenames = set()
+    for icon in spec['icons']:
+        icon.setdefault('maskable', False)
+        icon.setdefault('purpose', 'maskable' if icon['maskable'] else 'any')
+        icon.setdefault('style', None)
+        if icon['filename'] in filenames:
+            raise ValueError(f"Duplicate icon in {path}: {icon['filename']}")
+        filenames.add(icon['filename'])
+
+    for name, target in spec['targets'].items():
+        missing = [dep for dep in target.get('depends', [])
+                   if dep not in filenames and dep not in spec['targets']]
+        if missing:
+            raise ValueError(f"Target {name} depends on unknown targets: {missing}")
+
+    return spec
+
+
+def icon_sizes(spec, style=None):
+    """(size, filename, maskable) tuples for the icons a renderer style builds"""
+    return [(icon['size'], icon['filename'], icon['maskable'])
+            for icon in spec['icons']
+            if icon['style'] is None or icon['style'] == style]
+
+
+def select_targets(spec, patterns):
+    """Names of the targets matching any glob pattern, plus their dependencies"""
+    names = [icon['filename'] for icon in spec['icons']] + list(spec['targets'])
+    selected = {name for name in names if any(fnmatch(name, pattern) for pattern in patterns)}
+    if not selected:
+        raise ValueError(f"No icon targets match {', '.join(patterns)}")
+
+    pending = list(selected)
+    while pending:
+        target = spec['targets'].get(pending.pop(), {})
+        for dependency in target.get('depends', []):
+            if dependency not in selected:
+                selected.add(dependency)
+                pending.append(dependency)
+
+    return selected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the shared icon spec")
+    parser.add_argument('--list', action='store_true',
+                        help="print size:filename for every non-maskable icon")
+    parser.add_argument('--maskable', action='store_true',
+                        help="with --list, print the maskable icons instead")
+    args = parser.parse_args()
+
+    spec = load_icon_spec()
+    if args.list:
+        for icon in spec['icons']:
+            if icon['maskable'] == args.maskable:
+                print(f"{icon['size']}:{icon['filename']}")
+    else:
+        print(json.dumps(spec, indent=2))
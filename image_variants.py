@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Responsive WebP/AVIF variants for public/images
+Encodes every raster image at a width ladder and writes a srcset manifest
+
+    python3 image_variants.py                    # public/images -> public/images/variants
+    python3 image_variants.py --widths 480 960 1920 --jobs 4
+
+public/images/srcset.json maps each source URL to its variants, grouped
+by MIME type in the order a <picture> element should list them (AVIF
+first when this Pillow can encode it). Sources are keyed by a hash of
+their bytes and the encode settings, so only changed images are
+re-encoded; variants no longer referenced are deleted.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from icon_cache import fingerprint
+from icon_hashing import write_atomic
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+RASTER_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.tif', '.tiff', '.bmp'}
+
+# Pillow format, MIME type and encoder options per output format
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', lambda quality: {'quality': quality, 'speed': 6}),
+    # method 6 is ~40x slower on images with alpha for ~1% smaller files
+    'webp': ('WEBP', 'image/webp', lambda quality: {'quality': quality, 'method': 4}),
+}
+DEFAULT_QUALITY = {'avif': 50, 'webp': 80}
+
+# Variant files as encode_variants names them: <stem>.<hash8>-<width>.<format>
+VARIANT_NAME = re.compile(r'.+\.[0-9a-f]{8}-\d+\.(?:%s)' % '|'.join(FORMATS))
+
+
+def available_formats():
+    """Output formats this Pillow build can encode, best first"""
+    return [name for name in FORMATS if features.check(name)]
+
+
+def ladder(width, widths):
+    """Target widths for a source: the ladder below it, plus its own width if it fits"""
+    targets = {target for target in widths if target < width}
+    if width <= max(widths):
+        targets.add(width)
+    return sorted(targets, reverse=True)
+
+
+def encode_variants(source, output_dir, stem, widths, formats, quality):
+    """Worker: decode one source once and encode every width/format variant
+
+    Returns ((width, height), [variant, ...]) with each variant's file
+    name, width, height, format and byte size.
+    """
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+    variants = []
+    current = image
+    for width in ladder(image.width, widths):
+        height = max(1, round(image.height * width / image.width))
+        # Each step resizes from the previous (larger) one, never upscaling
+        if current.width != width:
+            current = current.resize((width, height), Image.LANCZOS, reducing_gap=2.0)
+
+        for name in formats:
+            pillow_format, _, options = FORMATS[name]
+            filename = f"{stem}-{width}.{name}"
+            path = os.path.join(output_dir, filename)
+            current.save(path + '.tmp', pillow_format, **options(quality[name]))
+            os.replace(path + '.tmp', path)
+            variants.append({'file': filename, 'width': width, 'height': height,
+                             'format': name, 'bytes': os.path.getsize(path)})
+
+    return image.size, variants
+
+
+def find_sources(directory, output_dir):
+    """Raster images under `directory`, skipping the variant output directory"""
+    sources = []
+    for root, subdirectories, files in os.walk(directory):
+        subdirectories[:] = sorted(name for name in subdirectories
+                                   if os.path.join(root, name) != output_dir)
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in RASTER_EXTENSIONS:
+                sources.append(os.path.join(root, name))
+    return sources
+
+
+def _url(path, public):
+    return '/' + os.path.relpath(path, public).replace(os.sep, '/')
+
+
+def build_variants(directory='public/images', output_dir=None, public='public', widths=WIDTHS,
+                   formats=None, quality=None, jobs=0, force=False, manifest_path=None):
+    """Encode the changed sources and rewrite the srcset manifest
+
+    Yields (source, status) with status 'fresh', 'encoded' or 'skipped'
+    (unreadable image). jobs=0 uses every core, 1 encodes in-process.
+    """
+    output_dir = output_dir or os.path.join(directory, 'variants')
+    manifest_path = manifest_path or os.path.join(directory, 'srcset.json')
+    formats = formats or available_formats()
+    quality = {**DEFAULT_QUALITY, **(quality or {})}
+    os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        with open(manifest_path, 'r') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    entries, todo = {}, []
+    for source in find_sources(directory, output_dir):
+        url = _url(source, public)
+        key = fingerprint([source, __file__], sorted(widths), formats,
+                          [quality[name] for name in formats])
+        old = previous.get(url)
+        if not force and old and old['key'] == key and all(
+                os.path.exists(os.path.join(output_dir, variant['file'])) for variant in old['variants']):
+            entries[url] = old
+            yield source, 'fresh'
+        else:
+            # The key doubles as the file name prefix, so new bytes get new URLs
+            stem = f"{os.path.splitext(os.path.basename(source))[0]}.{key[:8]}"
+            todo.append((source, url, key, stem))
+
+    pool = ProcessPoolExecutor(max_workers=jobs or None) if jobs != 1 and len(todo) > 1 else None
+    try:
+        if pool is not None:
+            futures = [pool.submit(encode_variants, source, output_dir, stem, widths, formats, quality)
+                       for source, _, _, stem in todo]
+        for index, (source, url, key, stem) in enumerate(todo):
+            try:
+                if pool is not None:
+                    size, variants = futures[index].result()
+                else:
+                    size, variants = encode_variants(source, output_dir, stem, widths, formats, quality)
+            except (UnidentifiedImageError, OSError):
+                yield source, 'skipped'
+                continue
+            entries[url] = _manifest_entry(url, key, size, variants, output_dir, public)
+            yield source, 'encoded'
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    # Drop variants that no entry references any more; anything else that
+    # lives in output_dir (subdirectories, other files) is left alone
+    referenced = {variant['file'] for entry in entries.values() for variant in entry['variants']}
+    for name in os.listdir(output_dir):
+        path = os.path.join(output_dir, name)
+        if name not in referenced and VARIANT_NAME.fullmatch(name) and os.path.isfile(path):
+            os.remove(path)
+
+    data = json.dumps(dict(sorted(entries.items())), indent=2) + '\n'
+    try:
+        with open(manifest_path, 'r') as f:
+            unchanged = f.read() == data
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        write_atomic(manifest_path, data)
+
+
+def _manifest_entry(url, key, size, variants, output_dir, public):
+    """srcset manifest entry: <picture> sources per MIME type plus every variant"""
+    sources = []
+    for name in FORMATS:
+        matching = [variant for variant in variants if variant['format'] == name]
+        if matching:
+            srcset = ', '.join(f"{_url(os.path.join(output_dir, variant['file']), public)} "
+                               f"{variant['width']}w" for variant in matching)
+            sources.append({'type': FORMATS[name][1], 'srcset': srcset})
+
+    return {
+        'key': key,
+        'width': size[0],
+        'height': size[1],
+        'fallback': url,
+        'sources': sources,
+        'variants': [{**variant, 'url': _url(os.path.join(output_dir, variant['file']), public)}
+                     for variant in variants],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create responsive WebP/AVIF variants of public/images")
+    parser.add_argument('--directory', default='public/images',
+                        help="source image directory")
+    parser.add_argument('--public', default='public',
+                        help="web root the URLs are relative to")
+    parser.add_argument('--widths', nargs='+', type=int, default=list(WIDTHS),
+                        help="width ladder in pixels")
+    parser.add_argument('--formats', nargs='+', choices=sorted(FORMATS),
+                        help="output formats (default: every format this Pillow can encode)")
+    parser.add_argument('--webp-quality', type=int, default=DEFAULT_QUALITY['webp'])
+    parser.add_argument('--avif-quality', type=int, default=DEFAULT_QUALITY['avif'])
+    parser.add_argument('--jobs', type=int, default=0,
+                        help="encode in N worker processes (0 = all cores, 1 = in-process)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-encode every source")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error(f"--jobs must be 0 (all cores) or a positive number of workers, got {args.jobs}")
+
+    formats = args.formats or available_formats()
+    unsupported = [name for name in formats if not features.check(name)]
+    if unsupported:
+        parser.error(f"this Pillow build cannot encode {', '.join(unsupported)}")
+    # Keep the best-first order whatever order they were given in
+    formats = [name for name in FORMATS if name in formats]
+
+    print(f"🖼️  Building {'/'.join(formats)} variants for {args.directory} "
+          f"({', '.join(str(width) for width in sorted(args.widths))} px)")
+    counts = {'fresh': 0, 'encoded': 0, 'skipped': 0}
+    results = build_variants(args.directory, public=args.public, widths=args.widths,
+                             formats=formats,
+                             quality={'webp': args.webp_quality, 'avif': args.avif_quality},
+                             jobs=args.jobs, force=args.force)
+    for source, status in results:
+        counts[status] += 1
+        if status == 'encoded':
+            print(f"✅ Encoded: {source}")
+        elif status == 'skipped':
+            print(f"⚠️  Skipped (not a readable image): {source}")
+
+    print(f"📦 {counts['encoded']} encoded, {counts['fresh']} up to date, {counts['skipped']} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
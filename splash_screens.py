@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+iOS and Android splash screens in the professional AEYE.NG style
+Renders every device resolution in horizontal strips so memory stays flat at any size
+
+    python3 splash_screens.py                  # public/splash/splash-<w>x<h>.png
+    python3 splash_screens.py --links          # also print the <link> tags for layout.tsx
+
+Only a strip of STRIP_ROWS rows and the logo sprite are ever in memory:
+each strip is painted from the gradient row table, the logo is composited
+into the strips it overlaps, and the rows are streamed straight into a PNG
+file. Devices sharing a resolution share one file.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageChops
+
+from create_professional_logo import FONT_PATHS, GRADIENT_COLORS, create_professional_logo
+from icon_build import check_jobs, renderer_fingerprint
+from icon_cache import IconCache, fingerprint
+from icon_fonts import resolve_font
+from icon_gradients import _normalize_stops, gradient_row_table
+from icon_layers import composite
+
+# (platform, device, portrait width, portrait height, CSS pixel ratio)
+DEVICES = [
+    ('ios', 'iPad Pro 12.9"', 2048, 2732, 2),
+    ('ios', 'iPad Pro 11"', 1668, 2388, 2),
+    ('ios', 'iPad Air 10.9"', 1640, 2360, 2),
+    ('ios', 'iPad Air 10.5"', 1668, 2224, 2),
+    ('ios', 'iPad 10.2"', 1620, 2160, 2),
+    ('ios', 'iPad mini 8.3"', 1488, 2266, 2),
+    ('ios', 'iPad mini 7.9"', 1536, 2048, 2),
+    ('ios', 'iPhone 15 Pro Max', 1290, 2796, 3),
+    ('ios', 'iPhone 14 Pro Max', 1290, 2796, 3),
+    ('ios', 'iPhone 15 Pro', 1179, 2556, 3),
+    ('ios', 'iPhone 14 Pro', 1179, 2556, 3),
+    ('ios', 'iPhone 14 Plus', 1284, 2778, 3),
+    ('ios', 'iPhone 14', 1170, 2532, 3),
+    ('ios', 'iPhone 13', 1170, 2532, 3),
+    ('ios', 'iPhone 13 mini', 1080, 2340, 3),
+    ('ios', 'iPhone 11 Pro Max', 1242, 2688, 3),
+    ('ios', 'iPhone 11 Pro', 1125, 2436, 3),
+    ('ios', 'iPhone X', 1125, 2436, 3),
+    ('ios', 'iPhone 11', 828, 1792, 2),
+    ('ios', 'iPhone 8 Plus', 1242, 2208, 3),
+    ('ios', 'iPhone SE', 750, 1334, 2),
+    ('android', 'mdpi', 320, 480, 1),
+    ('android', 'hdpi', 480, 800, 1.5),
+    ('android', 'xhdpi', 720, 1280, 2),
+    ('android', 'xxhdpi', 960, 1600, 3),
+    ('android', 'xxxhdpi', 1280, 1920, 4),
+]
+
+STRIP_ROWS = 64
+# The logo spans this share of the short side, capped so its sprite stays small
+LOGO_RATIO = 0.3
+LOGO_MAX = 1024
+# zlib level per icon_encode profile name
+COMPRESS_LEVELS = {'dev': 1, 'standard': 6, 'release': 9}
+
+
+def splash_targets(devices=DEVICES, orientations=('portrait', 'landscape')):
+    """{(width, height): [(platform, device, orientation, ratio), ...]} with one entry per resolution"""
+    targets = {}
+    for platform, device, width, height, ratio in devices:
+        for orientation in orientations:
+            size = (width, height) if orientation == 'portrait' else (height, width)
+            targets.setdefault(size, []).append((platform, device, orientation, ratio))
+    return targets
+
+
+def logo_placement(width, height):
+    """Logo size and top-left corner, centered slightly above the middle"""
+    size = min(LOGO_MAX, int(min(width, height) * LOGO_RATIO))
+    return size, ((width - size) // 2, int(height * 0.45) - size // 2)
+
+
+def paint_strips(width, height, logo, position, rows=STRIP_ROWS):
+    """Yield (top, RGB strip) covering the splash screen from the top down"""
+    table = gradient_row_table(height, _normalize_stops(GRADIENT_COLORS))
+    logo_x, logo_y = position
+
+    for top in range(0, height, rows):
+        count = min(rows, height - top)
+        # Same rows linear_gradient would produce, one strip at a time
+        strip = Image.frombytes('RGBA', (1, count), table[top * 4:(top + count) * 4])
+        strip = strip.resize((width, count), Image.NEAREST)
+        if logo_y < top + count and top < logo_y + logo.height:
+            composite(strip, logo, (logo_x, logo_y - top))
+        yield top, strip.convert('RGB')
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def write_png_strips(path, width, height, strips, level=6):
+    """Stream RGB strips into an 8-bit PNG without holding the whole image
+
+    Rows use the PNG Sub filter, computed for a whole strip at once as the
+    strip minus itself shifted one pixel right; the gradient rows are
+    constant across, so they filter to almost nothing but zeros.
+    """
+    compressor = zlib.compressobj(level)
+    stride = width * 3
+    temp_path = path + '.tmp'
+
+    with open(temp_path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+
+        for _, strip in strips:
+            shifted = Image.new('RGB', strip.size, (0, 0, 0))
+            shifted.paste(strip.crop((0, 0, width - 1, strip.height)), (1, 0))
+            data = ImageChops.subtract_modulo(strip, shifted).tobytes()
+            rows = b''.join(b'\x01' + data[y * stride:(y + 1) * stride] for y in range(strip.height))
+            compressed = compressor.compress(rows)
+            if compressed:
+                f.write(_chunk(b'IDAT', compressed))
+
+        f.write(_chunk(b'IDAT', compressor.flush()))
+        f.write(_chunk(b'IEND', b''))
+    os.replace(temp_path, path)
+
+
+def render_splash(path, width, height, level=6):
+    """Worker: render one splash screen to `path`"""
+    logo_size, position = logo_placement(width, height)
+    logo = create_professional_logo(logo_size, False)
+    write_png_strips(path, width, height, paint_strips(width, height, logo, position), level)
+    return path
+
+
+def splash_filename(width, height):
+    return f"splash-{width}x{height}.png"
+
+
+def media_query(width, height, orientation, ratio):
+    """apple-touch-startup-image media query for a device in CSS pixels
+
+    `width` and `height` are the portrait pixel size: iOS device-width and
+    device-height do not change on rotation, only the orientation does.
+    """
+    return (f"(device-width: {round(width / ratio)}px) and (device-height: {round(height / ratio)}px) "
+            f"and (-webkit-device-pixel-ratio: {ratio}) and (orientation: {orientation})")
+
+
+def link_tags(targets, url_prefix='/splash'):
+    """<link rel="apple-touch-startup-image"> tags for the iOS targets, one per media query"""
+    tags = []
+    for (width, height), devices in targets.items():
+        href = f"{url_prefix}/{splash_filename(width, height)}"
+        for platform, _, orientation, ratio in devices:
+            if platform != 'ios':
+                continue
+            portrait = (width, height) if orientation == 'portrait' else (height, width)
+            tag = (f'<link rel="apple-touch-startup-image" '
+                   f'media="{media_query(*portrait, orientation, ratio)}" href="{href}" />')
+            if tag not in tags:
+                tags.append(tag)
+    return tags
+
+
+def build_splash_screens(directory='public/splash', targets=None, jobs=1, cache=None,
+                         encoding='standard'):
+    """Render every splash resolution that changed
+
+    Yields ((width, height), path, status) with status 'fresh' or 'miss'.
+    Splash files are too large to be worth keeping as cache blobs, so the
+    cache only records outputs to skip unchanged ones. jobs > 1 renders in
+    a process pool (0 = all cores); each worker still holds one strip.
+    """
+    targets = splash_targets() if targets is None else targets
+    os.makedirs(directory, exist_ok=True)
+    renderer_key = renderer_fingerprint(create_professional_logo, [resolve_font('bold', FONT_PATHS)])
+    level = COMPRESS_LEVELS[encoding]
+
+    todo = []
+    for width, height in targets:
+        path = os.path.join(directory, splash_filename(width, height))
+        key = fingerprint([__file__], renderer_key, width, height, level, STRIP_ROWS)
+        if cache is not None and cache.is_fresh(path, key):
+            cache.hits += 1
+            yield (width, height), path, 'fresh'
+        else:
+            todo.append(((width, height), path, key))
+
+    pool = ProcessPoolExecutor(max_workers=jobs or None) if jobs != 1 and len(todo) > 1 else None
+    try:
+        if pool is not None:
+            futures = [pool.submit(render_splash, path, *size, level) for size, path, _ in todo]
+        for index, (size, path, key) in enumerate(todo):
+            if pool is not None:
+                futures[index].result()
+            else:
+                render_splash(path, *size, level)
+            if cache is not None:
+                cache.misses += 1
+                cache.record(path, key)
+            yield size, path, 'miss'
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if cache is not None:
+        cache.save()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create iOS/Android splash screens")
+    parser.add_argument('--directory', default='public/splash',
+                        help="output directory")
+    parser.add_argument('--platform', choices=['ios', 'android'], action='append',
+                        help="only these platforms (repeatable; default: both)")
+    parser.add_argument('--orientation', choices=['portrait', 'landscape'], action='append',
+                        help="only these orientations (repeatable; default: both)")
+    parser.add_argument('--encoding', choices=sorted(COMPRESS_LEVELS), default='standard',
+                        help="PNG compression effort")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="render in N worker processes (0 = all cores)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-render every splash screen")
+    parser.add_argument('--links', action='store_true',
+                        help="print the apple-touch-startup-image <link> tags")
+    args = parser.parse_args(argv)
+    check_jobs(parser, args.jobs)
+
+    devices = [device for device in DEVICES if not args.platform or device[0] in args.platform]
+    targets = splash_targets(devices, args.orientation or ('portrait', 'landscape'))
+    screens = sum(len(entries) for entries in targets.values())
+    print(f"🌅 Creating {len(targets)} splash screens for {screens} device/orientation pairs")
+
+    cache = IconCache(force=args.force)
+    for (width, height), path, status in build_splash_screens(args.directory, targets, args.jobs,
+                                                              cache, args.encoding):
+        if status == 'fresh':
+            print(f"⏭️  Up to date: {path}")
+        else:
+            print(f"✅ Created: {path} ({width}x{height}, {os.path.getsize(path)} bytes)")
+    print(f"📦 Build cache: {cache.hits} up to date, {cache.misses} rendered")
+
+    if args.links:
+        url_prefix = '/' + os.path.relpath(args.directory, 'public').replace(os.sep, '/')
+        print()
+        print("\n".join(link_tags(targets, url_prefix)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
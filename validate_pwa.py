@@ -2,118 +2,705 @@
 """
 Validate PWA requirements for Any Print Summarizer
 Checks manifest, service worker, icons, and other requirements
+
+The checks are independent, so they run side by side in a thread pool and
+each one records a CheckResult instead of printing. Results are reported
+in a fixed order as text, JSON or JUnit XML:
+
+    python3 validate_pwa.py --format junit --output pwa-report.xml
+    python3 validate_pwa.py --watch      # re-validate what changed, on every save
+
+Many projects (white-label copies) are validated in one run by passing
+several --root options, a glob or a --roots-file; they are checked in a
+process pool and reported together:
+
+    python3 validate_pwa.py --root 'brands/*' --format json --output pwa-report.json
 """
 
+import argparse
+import glob
+import gzip
+import hashlib
 import json
+import mmap
 import os
+import re
+import struct
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
-def validate_manifest():
-    """Validate the manifest.json meets PWA requirements"""
-    print("🔍 Validating manifest.json...")
-    
+PASS, FAIL, ERROR = 'pass', 'fail', 'error'
+
+# Emoji used for each message level in the text report
+LEVEL_MARKS = {'pass': '✅', 'fail': '❌', 'info': 'ℹ️ ', 'warn': '⚠️ '}
+
+
+class CheckResult:
+    """Outcome of one validation: status, ordered messages and elapsed time
+
+    A check starts out passing; fail() marks it failed and error() marks
+    it as broken (it could not finish). Messages are (level, text) pairs.
+
+    Checks pass every file they look at through depends(), which records
+    it as an input; with `track` set, its state is snapshotted before the
+    check reads it so watch mode knows when to rerun the check.
+    """
+
+    def __init__(self, name, title='', track=False):
+        self.name = name
+        self.title = title
+        self.status = PASS
+        self.messages = []
+        self.elapsed = 0.0
+        self.track = track
+        self.inputs = {}
+        self.cached = False
+
+    def depends(self, path):
+        """Record `path` as an input of this check and return it"""
+        key = str(path)
+        if key not in self.inputs:
+            self.inputs[key] = snapshot_input(key) if self.track else None
+        return path
+
+    def ok(self, text):
+        self.messages.append(('pass', text))
+
+    def info(self, text):
+        self.messages.append(('info', text))
+
+    def warn(self, text):
+        self.messages.append(('warn', text))
+
+    def fail(self, text):
+        self.messages.append(('fail', text))
+        if self.status == PASS:
+            self.status = FAIL
+
+    def error(self, text):
+        self.messages.append(('fail', text))
+        self.status = ERROR
+
+    @property
+    def passed(self):
+        return self.status == PASS
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'title': self.title,
+            'status': self.status,
+            'elapsed': round(self.elapsed, 6),
+            'messages': [{'level': level, 'text': text} for level, text in self.messages],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        result = cls(data['name'], data.get('title', ''))
+        result.status = data['status']
+        result.elapsed = data.get('elapsed', 0.0)
+        result.messages = [(message['level'], message['text']) for message in data['messages']]
+        return result
+
+
+def snapshot_input(path):
+    """[mtime_ns, size, sha256] for a file, ['dir'] for a directory, None if missing"""
     try:
-        with open('public/manifest.json', 'r') as f:
-            manifest = json.load(f)
-        
-        print("✅ Manifest JSON is valid")
-        
-        # Check required fields
-        required_fields = ['name', 'short_name', 'start_url', 'display', 'icons']
-        missing_fields = []
-        
-        for field in required_fields:
-            if field not in manifest:
-                missing_fields.append(field)
-        
-        if missing_fields:
-            print(f"❌ Missing required fields: {missing_fields}")
-            return False
-        else:
-            print("✅ All required manifest fields present")
-        
-        # Check icons
-        icons = manifest.get('icons', [])
-        if len(icons) < 2:
-            print("❌ Need at least 2 icons (192x192 and 512x512)")
-            return False
-        
-        # Check for required icon sizes
-        sizes = [icon['sizes'] for icon in icons]
-        required_sizes = ['192x192', '512x512']
-        
-        has_required_sizes = all(size in sizes for size in required_sizes)
-        if not has_required_sizes:
-            print("❌ Missing required icon sizes: 192x192 and 512x512")
-            return False
-        else:
-            print("✅ Required icon sizes present")
-        
-        # Check display mode
-        if manifest.get('display') in ['standalone', 'fullscreen', 'minimal-ui']:
-            print(f"✅ Valid display mode: {manifest.get('display')}")
-        else:
-            print(f"❌ Invalid display mode: {manifest.get('display')}")
-            return False
-        
-        # Check start_url
-        if manifest.get('start_url'):
-            print(f"✅ Start URL: {manifest.get('start_url')}")
-        else:
-            print("❌ Missing start_url")
-            return False
-            
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if os.path.isdir(path):
+        return ['dir']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+
+
+def input_changed(path, recorded):
+    """Compare a file with its snapshot, hashing only when mtime or size moved
+
+    A file touched without changing its content counts as unchanged, and
+    its snapshot is updated in place so the next poll is stat-only again.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return recorded is not None
+    if recorded is None:
         return True
-        
-    except Exception as e:
-        print(f"❌ Error validating manifest: {e}")
+    if recorded == ['dir'] or os.path.isdir(path):
+        return recorded != ['dir'] or not os.path.isdir(path)
+    if [stat.st_mtime_ns, stat.st_size] == recorded[:2]:
         return False
 
-def validate_service_worker():
-    """Validate service worker exists and is properly structured"""
-    print("\n🔍 Validating service worker...")
-    
-    sw_path = Path('public/sw.js')
+    current = snapshot_input(path)
+    if current is None or current[2] != recorded[2]:
+        return True
+    recorded[:2] = current[:2]
+    return False
+
+
+class ValidationCache:
+    """On-disk record of each check's inputs and last result
+
+    Entries are dropped when validate_pwa.py itself or the check `settings`
+    (such as the precache budget) change, since the checks may then give
+    different answers for the same files.
+    """
+
+    def __init__(self, path, settings=None):
+        self.path = path
+        digest = hashlib.sha256(repr(sorted((settings or {}).items())).encode())
+        with open(__file__, 'rb') as f:
+            digest.update(f.read())
+        self.version = digest.hexdigest()
+
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.entries = data.get('checks', {}) if data.get('version') == self.version else {}
+
+    def lookup(self, name):
+        """Return the cached CheckResult for `name` if none of its inputs changed"""
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        if any(input_changed(path, recorded) for path, recorded in entry['inputs'].items()):
+            return None
+
+        result = CheckResult.from_dict(entry['result'])
+        result.cached = True
+        return result
+
+    def store(self, result):
+        # Errors are kept too: rerunning a crashed check on unchanged inputs
+        # would only crash again (and reprint on every --watch poll)
+        self.entries[result.name] = {'inputs': result.inputs, 'result': result.to_dict()}
+
+    def save(self):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'version': self.version, 'checks': self.entries}, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+# Parsed file contents by (parser, sha256 of the bytes), least recently used
+# first. Identical files in different projects (or read by different checks)
+# are parsed once per process; the bound keeps a long --watch session from
+# holding on to every version of every file it has seen.
+PARSE_CACHE_SIZE = 512
+_parsed = OrderedDict()
+_parsed_lock = threading.Lock()
+
+
+def parse_cached(data, parse):
+    """Return parse(data), reusing the result for byte-identical input
+
+    Callers must treat the returned value as read-only, since it is shared.
+    """
+    key = (parse, hashlib.sha256(data).digest())
+    with _parsed_lock:
+        if key in _parsed:
+            _parsed.move_to_end(key)
+            return _parsed[key]
+
+    value = parse(data)
+    with _parsed_lock:
+        _parsed[key] = value
+        while len(_parsed) > PARSE_CACHE_SIZE:
+            _parsed.popitem(last=False)
+    return value
+
+
+def validate_manifest(result, root='.'):
+    """Validate the manifest.json meets PWA requirements"""
+    try:
+        manifest = parse_cached(result.depends(Path(root) / 'public/manifest.json').read_bytes(),
+                                json.loads)
+    except Exception as e:
+        result.fail(f"Error validating manifest: {e}")
+        return
+
+    result.ok("Manifest JSON is valid")
+
+    # Check required fields
+    required_fields = ['name', 'short_name', 'start_url', 'display', 'icons']
+    missing_fields = [field for field in required_fields if field not in manifest]
+
+    if missing_fields:
+        result.fail(f"Missing required fields: {missing_fields}")
+        return
+    result.ok("All required manifest fields present")
+
+    # Check icons
+    icons = manifest.get('icons', [])
+    if len(icons) < 2:
+        result.fail("Need at least 2 icons (192x192 and 512x512)")
+        return
+
+    # Check for required icon sizes
+    sizes = [icon.get('sizes') for icon in icons]
+    required_sizes = ['192x192', '512x512']
+
+    if not all(size in sizes for size in required_sizes):
+        result.fail("Missing required icon sizes: 192x192 and 512x512")
+        return
+    result.ok("Required icon sizes present")
+
+    # Check display mode
+    if manifest.get('display') in ['standalone', 'fullscreen', 'minimal-ui']:
+        result.ok(f"Valid display mode: {manifest.get('display')}")
+    else:
+        result.fail(f"Invalid display mode: {manifest.get('display')}")
+        return
+
+    # Check start_url
+    if manifest.get('start_url'):
+        result.ok(f"Start URL: {manifest.get('start_url')}")
+    else:
+        result.fail("Missing start_url")
+
+
+_STRING_LITERAL = re.compile(r"""'((?:[^'\\\n]|\\.)*)'|"((?:[^"\\\n]|\\.)*)"|`([^`$]*)`""")
+_COMMENT = re.compile(_STRING_LITERAL.pattern + r'|//[^\n]*|/\*.*?\*/', re.S)
+# A string literal, or an identifier that may name an array of them
+_PRECACHE_TOKEN = re.compile(_STRING_LITERAL.pattern + r'|([A-Za-z_$][\w$]*)')
+
+
+def _balanced(text, start):
+    """Return the index just past the bracket group opening at text[start]
+
+    Skips over string literals and comments so brackets inside them do
+    not count. Returns len(text) when the group is never closed.
+    """
+    closing = {'(': ')', '[': ']', '{': '}'}
+    stack = []
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char in '\'"`':
+            i += 1
+            while i < len(text) and text[i] != char:
+                i += 2 if text[i] == '\\' else 1
+        elif text.startswith('//', i):
+            i = text.find('\n', i)
+            i = len(text) if i < 0 else i
+        elif text.startswith('/*', i):
+            i = text.find('*/', i)
+            i = len(text) if i < 0 else i + 1
+        elif char in closing:
+            stack.append(closing[char])
+        elif stack and char == stack[-1]:
+            stack.pop()
+            if not stack:
+                return i + 1
+        i += 1
+    return len(text)
+
+
+def _strip_comments(text):
+    """Blank out // and /* */ comments, leaving string literals alone"""
+    return _COMMENT.sub(lambda match: match.group(0) if match.group(0)[0] in '\'"`' else ' ', text)
+
+
+def _array_literal(source, name):
+    """Text of the array literal bound to `name` (const/let/var NAME = [...]), or None"""
+    match = re.search(r'\b(?:const|let|var)\s+' + re.escape(name) + r'\s*=\s*\[', source)
+    if match is None:
+        return None
+    start = match.end() - 1
+    return source[start:_balanced(source, start)]
+
+
+def extract_precache_urls(source):
+    """URLs a service worker precaches, in first-seen order
+
+    Reads the arguments of every addAll() call: string literals written
+    inline, plus those in array literals the arguments name (including
+    spreads and .concat() of such arrays). Commented-out code is ignored:
+
+    >>> extract_precache_urls("const SHELL = ['/', '/app.js'];\\n"
+    ...                       "// cache.addAll(['/commented.js'])\\n"
+    ...                       "/* cache.addAll(['/blocked.css']) */\\n"
+    ...                       "cache.addAll([...SHELL, '/offline.html']);")
+    ['/', '/app.js', '/offline.html']
+    """
+    source = _strip_comments(source)
+    urls = []
+    seen_names = set()
+
+    def collect(text):
+        for match in _PRECACHE_TOKEN.finditer(text):
+            *strings, name = match.groups()
+            if name is None:
+                url = next(group for group in strings if group is not None)
+                if url not in urls:
+                    urls.append(url)
+            elif name not in seen_names:
+                seen_names.add(name)
+                literal = _array_literal(source, name)
+                if literal is not None:
+                    collect(literal)
+
+    for match in re.finditer(r'\.addAll\s*\(', source):
+        start = match.end() - 1
+        collect(source[start + 1:_balanced(source, start) - 1])
+
+    return urls
+
+
+def resolve_precache_url(result, root, url):
+    """Map a precached URL to the file that will serve it, or None
+
+    Looks in public/ first, then the Next.js build output: .next/static
+    for /_next/static/ assets, prerendered pages under .next/server, and a
+    static export in out/. Every candidate is recorded as an input.
+    """
+    path = url.split('#')[0].split('?')[0]
+    relative = path.lstrip('/')
+    route = relative.rstrip('/') or 'index'
+
+    candidates = [Path(root) / 'public' / relative] if relative else []
+    if relative.startswith('_next/static/'):
+        candidates.append(Path(root) / '.next/static' / relative[len('_next/static/'):])
+    else:
+        for directory in ('.next/server/app', '.next/server/pages', 'out'):
+            candidates.append(Path(root) / directory / f'{route}.html')
+            candidates.append(Path(root) / directory / route / 'index.html')
+        candidates.append(Path(root) / 'out' / relative)
+
+    for candidate in candidates:
+        if result.depends(candidate).is_file():
+            return candidate
+    return None
+
+
+def _is_page_route(url):
+    """True for URLs such as / or /about that name a page rather than a static file
+
+    >>> [_is_page_route(url) for url in ('/', '/about/', '/offline?x=1', '/app.js', '/_next/static/a')]
+    [True, True, True, False, False]
+    """
+    path = url.split('#')[0].split('?')[0]
+    return not path.lstrip('/').startswith('_next/static/') and '.' not in path.rsplit('/', 1)[-1]
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _precache_urls(data):
+    return extract_precache_urls(data.decode())
+
+
+def _gzip_size(data):
+    return len(gzip.compress(data, 9, mtime=0))
+
+
+def validate_service_worker(result, root='.', precache_budget=None):
+    """Validate service worker exists and is properly structured
+
+    Also sizes the install-time precache. With `precache_budget` (bytes),
+    the check fails when the gzip-compressed precache exceeds it.
+    """
+    sw_path = result.depends(Path(root) / 'public/sw.js')
     if not sw_path.exists():
-        print("❌ Service worker not found at public/sw.js")
-        return False
-    
-    print("✅ Service worker file exists")
-    
+        result.fail("Service worker not found at public/sw.js")
+        return
+
+    result.ok("Service worker file exists")
+
     # Read and validate service worker content
     try:
         with open(sw_path, 'r') as f:
             sw_content = f.read()
-        
-        # Check for essential event listeners
-        required_events = ['install', 'activate', 'fetch']
-        missing_events = []
-        
-        for event in required_events:
-            if f"addEventListener('{event}'" not in sw_content:
-                missing_events.append(event)
-        
-        if missing_events:
-            print(f"❌ Missing event listeners: {missing_events}")
-            return False
-        else:
-            print("✅ Essential service worker events present")
-        
-        return True
-        
     except Exception as e:
-        print(f"❌ Error reading service worker: {e}")
-        return False
+        result.fail(f"Error reading service worker: {e}")
+        return
+
+    # Check for essential event listeners
+    required_events = ['install', 'activate', 'fetch']
+    missing_events = [event for event in required_events
+                      if f"addEventListener('{event}'" not in sw_content]
+
+    if missing_events:
+        result.fail(f"Missing event listeners: {missing_events}")
+        return
+    result.ok("Essential service worker events present")
+
+    # Size what the worker downloads at install time
+    urls = parse_cached(sw_content.encode(), _precache_urls)
+    if not urls:
+        result.info("No precache list found (no addAll() calls)")
+        return
+
+    total = total_gzip = checked = 0
+    missing = []
+    unbuilt = []
+    for url in urls:
+        if url.startswith(('http://', 'https://', '//')):
+            result.info(f"Precache {url}: cross-origin, not sized")
+            continue
+        path = resolve_precache_url(result, root, url)
+        if path is None:
+            # Page routes only exist once the app is built; static files always should
+            (unbuilt if _is_page_route(url) else missing).append(url)
+            continue
+        checked += 1
+        data = path.read_bytes()
+        compressed = parse_cached(data, _gzip_size)
+        total += len(data)
+        total_gzip += compressed
+        result.info(f"Precache {url}: {format_bytes(len(data))} ({format_bytes(compressed)} gzip)")
+
+    if unbuilt:
+        result.warn(f"Precached pages not found in a build (.next/ or out/); run the build "
+                    f"to size them: {unbuilt}")
+    if missing:
+        result.fail(f"Precached URLs with no file in public/ or the build output: {missing}")
+
+    summary = (f"Precache total: {checked} sized URLs, {format_bytes(total)} "
+               f"({format_bytes(total_gzip)} gzip)")
+    if precache_budget is not None and total_gzip > precache_budget:
+        result.fail(f"{summary} exceeds the {format_bytes(precache_budget)} budget")
+    elif precache_budget is not None:
+        result.ok(f"{summary} within the {format_bytes(precache_budget)} budget")
+    else:
+        result.ok(summary)
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_COLOR_TYPES = {0: 'grayscale', 2: 'rgb', 3: 'palette', 4: 'grayscale+alpha', 6: 'rgba'}
+MANIFEST_PURPOSES = {'any', 'maskable', 'monochrome'}
+# MIME types a manifest may declare for each format read_icon_header knows
+FORMAT_TYPES = {
+    'png': ('image/png',),
+    'ico': ('image/x-icon', 'image/vnd.microsoft.icon'),
+    'webp': ('image/webp',),
+    'svg': ('image/svg+xml',),
+}
+
+
+class IconHeaderError(ValueError):
+    """Raised when an icon file is not a well-formed PNG, ICO, WebP or SVG"""
+
+
+def _png_header(data, offset=0):
+    """Parse the IHDR of a PNG starting at `offset` in a bytes-like buffer
+
+    Walks the chunk headers (not their data) up to the first IDAT to see
+    whether a tRNS chunk adds transparency to a palette or RGB image.
+    """
+    if data[offset:offset + 8] != PNG_SIGNATURE:
+        raise IconHeaderError("not a PNG file")
+    if len(data) < offset + 33 or data[offset + 12:offset + 16] != b'IHDR':
+        raise IconHeaderError("PNG is missing its IHDR chunk")
+
+    width, height, bit_depth, color_type = struct.unpack_from('>IIBB', data, offset + 16)
+    if color_type not in PNG_COLOR_TYPES:
+        raise IconHeaderError(f"PNG has an invalid color type {color_type}")
+
+    alpha = color_type in (4, 6)
+    position = offset + 33
+    while not alpha and position + 8 <= len(data):
+        length, chunk = struct.unpack_from('>I4s', data, position)
+        if chunk in (b'IDAT', b'IEND'):
+            break
+        alpha = chunk == b'tRNS'
+        position += 12 + length
+
+    return {'format': 'png', 'width': width, 'height': height, 'bit_depth': bit_depth,
+            'color_type': PNG_COLOR_TYPES[color_type], 'alpha': alpha}
+
+
+def _ico_header(data):
+    """Parse an ICO directory; PNG frames report their own IHDR dimensions"""
+    if len(data) < 6:
+        raise IconHeaderError("ICO header is truncated")
+    reserved, kind, count = struct.unpack_from('<HHH', data, 0)
+    if reserved != 0 or kind != 1 or count == 0:
+        raise IconHeaderError("not an ICO file")
+    if len(data) < 6 + 16 * count:
+        raise IconHeaderError("ICO directory is truncated")
+
+    frames = []
+    for index in range(count):
+        width, height, _, _, _, bit_count, size, offset = struct.unpack_from(
+            '<BBBBHHII', data, 6 + 16 * index)
+        if offset + size > len(data):
+            raise IconHeaderError(f"ICO frame {index} points past the end of the file")
+        if data[offset:offset + 8] == PNG_SIGNATURE:
+            frame = _png_header(data, offset)
+        else:
+            # BMP frame: the directory's 0 means 256
+            frame = {'format': 'bmp', 'width': width or 256, 'height': height or 256,
+                     'bit_depth': bit_count, 'alpha': bit_count == 32}
+        frames.append(frame)
+
+    return {'format': 'ico', 'frames': frames,
+            'width': max(frame['width'] for frame in frames),
+            'height': max(frame['height'] for frame in frames)}
+
+
+def _webp_header(data):
+    """Parse the canvas size and alpha flag from the first chunk of a WebP"""
+    if len(data) < 30:
+        raise IconHeaderError("WebP header is truncated")
+    chunk = data[12:16]
+    if chunk == b'VP8X':
+        flags = data[20]
+        width = int.from_bytes(data[24:27], 'little') + 1
+        height = int.from_bytes(data[27:30], 'little') + 1
+        alpha = bool(flags & 0x10)
+    elif chunk == b'VP8L':
+        if data[20] != 0x2f:
+            raise IconHeaderError("WebP lossless stream has a bad signature")
+        bits = int.from_bytes(data[21:25], 'little')
+        width = (bits & 0x3fff) + 1
+        height = (bits >> 14 & 0x3fff) + 1
+        alpha = bool(bits >> 28 & 1)
+    elif chunk == b'VP8 ':
+        if data[23:26] != b'\x9d\x01\x2a':
+            raise IconHeaderError("WebP lossy stream has no key frame")
+        width, height = (value & 0x3fff for value in struct.unpack_from('<HH', data, 26))
+        alpha = False
+    else:
+        raise IconHeaderError(f"WebP starts with an unknown chunk {bytes(chunk)!r}")
+    return {'format': 'webp', 'width': width, 'height': height, 'alpha': alpha}
 
-def validate_icons():
+
+def _is_svg(data):
+    start = bytes(data[:1024]).lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    return start.startswith(b'<svg') or (start.startswith((b'<?xml', b'<!doctype svg', b'<!--'))
+                                         and b'<svg' in start)
+
+
+def icon_header(data, declared_type=None):
+    """Format, dimensions and color details of an icon held in a bytes-like buffer
+
+    The parser is picked from the magic bytes; an SVG is also accepted when
+    the manifest declares image/svg+xml. Vector icons have no pixel size:
+
+    >>> icon_header(b'<svg xmlns="http://www.w3.org/2000/svg"/>')['format']
+    'svg'
+    >>> webp = b'RIFF\\x1a\\x00\\x00\\x00WEBPVP8L\\x0d\\x00\\x00\\x00\\x2f\\xbf\\xc0\\x2f\\x10'
+    >>> sorted(icon_header(webp + bytes(10)).items())
+    [('alpha', True), ('format', 'webp'), ('height', 192), ('width', 192)]
+    """
+    if data[:8] == PNG_SIGNATURE:
+        return _png_header(data)
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return _webp_header(data)
+    if data[:4] == b'\x00\x00\x01\x00':
+        return _ico_header(data)
+    if _is_svg(data) or declared_type in FORMAT_TYPES['svg']:
+        return {'format': 'svg', 'width': None, 'height': None, 'alpha': True}
+    raise IconHeaderError("not a PNG, ICO, WebP or SVG file")
+
+
+def read_icon_header(path, declared_type=None):
+    """Return the format, dimensions and color details of an icon file
+
+    Only the headers are read, through a memory map, so checking hundreds
+    of icons never decodes a pixel. See icon_header.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise IconHeaderError("file is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return icon_header(data, declared_type)
+
+
+def _describe(header):
+    if header['format'] == 'ico':
+        sizes = sorted({frame['width'] for frame in header['frames']})
+        return f"ICO, frames {', '.join(str(size) for size in sizes)}"
+    if header['format'] == 'svg':
+        return "SVG, scalable"
+    if header['format'] == 'webp':
+        return f"{header['width']}x{header['height']} WebP{' with alpha' if header['alpha'] else ''}"
+    return f"{header['width']}x{header['height']} {header['color_type']}"
+
+
+def _public_file(root, url):
+    """The file under public/ that serves a same-origin URL, ignoring ?query and #fragment
+
+    >>> _public_file('.', '/icons/icon.png?v=2#x').as_posix()
+    'public/icons/icon.png'
+    """
+    return Path(root) / 'public' / url.split('#')[0].split('?')[0].lstrip('/')
+
+
+def _check_manifest_icon(result, root, icon):
+    """Compare one manifest icon entry with the file it points at"""
+    src = icon.get('src', '')
+    declared_type = icon.get('type')
+    path = result.depends(_public_file(root, src))
+    try:
+        header = read_icon_header(path, declared_type)
+    except OSError:
+        result.fail(f"Manifest icon {src} not found")
+        return
+    except IconHeaderError as e:
+        result.fail(f"Manifest icon {src}: {e}")
+        return
+
+    problems = []
+
+    if declared_type and declared_type not in FORMAT_TYPES[header['format']]:
+        problems.append(f"type is {declared_type} but the file is {header['format'].upper()}")
+
+    declared_sizes = icon.get('sizes', '').split()
+    if header['format'] == 'ico':
+        actual_sizes = {f"{frame['width']}x{frame['height']}" for frame in header['frames']}
+        missing = [size for size in declared_sizes if size != 'any' and size not in actual_sizes]
+        if missing:
+            problems.append(f"declares {', '.join(missing)} but holds {', '.join(sorted(actual_sizes))}")
+    elif header['format'] == 'svg':
+        # Vector icons scale to any size; "any" is the usual declaration
+        pass
+    else:
+        actual = f"{header['width']}x{header['height']}"
+        if declared_sizes and 'any' not in declared_sizes and actual not in declared_sizes:
+            problems.append(f"declares {icon.get('sizes')} but is {actual}")
+        if header['width'] != header['height']:
+            problems.append(f"is not square ({actual})")
+
+    purposes = icon.get('purpose', 'any').split()
+    unknown = [purpose for purpose in purposes if purpose not in MANIFEST_PURPOSES]
+    if unknown:
+        problems.append(f"has unknown purpose {', '.join(unknown)}")
+    if 'monochrome' in purposes and not header.get('alpha'):
+        problems.append("is monochrome but has no alpha channel")
+
+    if problems:
+        for problem in problems:
+            result.fail(f"Manifest icon {src} {problem}")
+    else:
+        result.ok(f"Manifest icon {src} ({_describe(header)}, purpose {' '.join(purposes)})")
+
+
+def validate_icons(result, root='.'):
     """Validate all required icons exist and have proper sizes"""
-    print("\n🔍 Validating icons...")
-    
-    icons_dir = Path('public/icons')
+    icons_dir = result.depends(Path(root) / 'public/icons')
     if not icons_dir.exists():
-        print("❌ Icons directory not found")
-        return False
-    
+        result.fail("Icons directory not found")
+        return
+
     # Required icon files for PWA
     required_icons = {
         'icon-192x192.png': 192,
@@ -121,111 +708,467 @@ def validate_icons():
         'favicon-16x16.png': 16,
         'favicon-32x32.png': 32,
     }
-    
+
     missing_icons = []
-    
+
     for icon_name, expected_size in required_icons.items():
-        icon_path = icons_dir / icon_name
-        
+        icon_path = result.depends(icons_dir / icon_name)
+
         if not icon_path.exists():
             missing_icons.append(icon_name)
+            continue
+
+        # Check the real dimensions from the PNG header
+        try:
+            header = read_icon_header(icon_path)
+        except IconHeaderError as e:
+            result.fail(f"{icon_name}: {e}")
+            missing_icons.append(icon_name)
+            continue
+
+        if header['format'] != 'png':
+            result.fail(f"{icon_name} is not a PNG file")
+        elif (header['width'], header['height']) != (expected_size, expected_size):
+            result.fail(f"{icon_name} is {header['width']}x{header['height']}, "
+                        f"expected {expected_size}x{expected_size}")
         else:
-            # Check file size (should not be 0)
-            file_size = icon_path.stat().st_size
-            if file_size == 0:
-                print(f"❌ {icon_name} is empty (0 bytes)")
-                missing_icons.append(icon_name)
-            else:
-                print(f"✅ {icon_name} exists ({file_size} bytes)")
-    
+            result.ok(f"{icon_name} exists ({_describe(header)}, "
+                      f"{icon_path.stat().st_size} bytes)")
+
     if missing_icons:
-        print(f"❌ Missing or empty icons: {missing_icons}")
-        return False
-    
+        result.fail(f"Missing or unreadable icons: {missing_icons}")
+        return
+
     # Check favicon
-    favicon_path = Path('public/favicon.ico')
-    if favicon_path.exists():
-        print(f"✅ favicon.ico exists ({favicon_path.stat().st_size} bytes)")
-    else:
-        print("❌ favicon.ico missing")
-        return False
-    
-    return True
+    favicon_path = result.depends(Path(root) / 'public/favicon.ico')
+    try:
+        header = read_icon_header(favicon_path)
+    except OSError:
+        result.fail("favicon.ico missing")
+        return
+    except IconHeaderError as e:
+        result.fail(f"favicon.ico: {e}")
+        return
+
+    if header['format'] == 'png':
+        result.warn("favicon.ico is a PNG file, not an ICO")
+    result.ok(f"favicon.ico exists ({_describe(header)}, {favicon_path.stat().st_size} bytes)")
 
-def validate_https_requirement():
+    # Check every icon the manifest points at
+    try:
+        manifest = parse_cached(result.depends(Path(root) / 'public/manifest.json').read_bytes(),
+                                json.loads)
+        manifest_icons = manifest.get('icons', [])
+    except (OSError, ValueError):
+        result.info("No readable manifest.json; skipping manifest icon checks")
+        return
+
+    for icon in manifest_icons:
+        _check_manifest_icon(result, root, icon)
+
+    if not any('maskable' in icon.get('purpose', '').split() for icon in manifest_icons):
+        result.warn("No maskable icon in manifest.json")
+
+
+def validate_https_requirement(result, root='.'):
     """Check HTTPS requirement (for production)"""
-    print("\n🔍 Validating HTTPS requirement...")
-    
     # For localhost, PWA works without HTTPS
     # For production, HTTPS is required
-    print("ℹ️  PWA requires HTTPS in production")
-    print("ℹ️  Render.com provides HTTPS by default")
-    print("✅ HTTPS requirement will be met in production")
-    
-    return True
+    result.info("PWA requires HTTPS in production")
+    result.info("Render.com provides HTTPS by default")
+    result.ok("HTTPS requirement will be met in production")
+
 
-def validate_manifest_registration():
+def validate_manifest_registration(result, root='.'):
     """Check if manifest is properly registered in HTML"""
-    print("\n🔍 Validating manifest registration...")
-    
-    layout_path = Path('src/app/layout.tsx')
+    layout_path = result.depends(Path(root) / 'src/app/layout.tsx')
     if not layout_path.exists():
-        print("❌ Layout file not found")
-        return False
-    
+        result.fail("Layout file not found")
+        return
+
     try:
         with open(layout_path, 'r') as f:
             layout_content = f.read()
-        
-        if 'manifest: \'/manifest.json\'' in layout_content:
-            print("✅ Manifest registered in layout.tsx")
-            return True
-        else:
-            print("❌ Manifest not properly registered in layout.tsx")
-            return False
-            
     except Exception as e:
-        print(f"❌ Error checking manifest registration: {e}")
-        return False
+        result.fail(f"Error checking manifest registration: {e}")
+        return
+
+    if 'manifest: \'/manifest.json\'' in layout_content:
+        result.ok("Manifest registered in layout.tsx")
+    else:
+        result.fail("Manifest not properly registered in layout.tsx")
+
+
+# (name, title, check) in report order
+CHECKS = [
+    ('manifest', "Validating manifest.json", validate_manifest),
+    ('service-worker', "Validating service worker", validate_service_worker),
+    ('icons', "Validating icons", validate_icons),
+    ('https', "Validating HTTPS requirement", validate_https_requirement),
+    ('manifest-registration', "Validating manifest registration", validate_manifest_registration),
+]
+
+
+def run_check(name, title, check, root='.', track=False):
+    """Run one check and time it; an unexpected exception becomes an error result"""
+    result = CheckResult(name, title, track)
+    start = time.perf_counter()
+    try:
+        check(result, root)
+    except Exception as e:
+        result.error(f"Check crashed: {type(e).__name__}: {e}")
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_checks(root='.', checks=CHECKS, jobs=None, cache=None):
+    """Run `checks` concurrently and return their results in `checks` order
+
+    With a ValidationCache, checks whose inputs are unchanged reuse their
+    cached result and only the rest run.
+    """
+    results = {}
+    if cache is not None:
+        for name, _, _ in checks:
+            cached = cache.lookup(name)
+            if cached is not None:
+                results[name] = cached
+
+    pending = [entry for entry in checks if entry[0] not in results]
+    if pending and jobs == 1:
+        for name, title, check in pending:
+            results[name] = run_check(name, title, check, root, cache is not None)
+            if cache is not None:
+                cache.store(results[name])
+    elif pending:
+        with ThreadPoolExecutor(max_workers=jobs or len(pending)) as pool:
+            futures = {name: pool.submit(run_check, name, title, check, root, cache is not None)
+                       for name, title, check in pending}
+            for name, future in futures.items():
+                results[name] = future.result()
+                if cache is not None:
+                    cache.store(results[name])
+
+    return [results[name] for name, _, _ in checks]
+
 
-def main():
-    """Run all PWA validations"""
-    print("🚀 AEYE Summarizer PWA Validation")
-    print("=" * 50)
-    
-    validations = [
-        validate_manifest,
-        validate_service_worker, 
-        validate_icons,
-        validate_https_requirement,
-        validate_manifest_registration
-    ]
-    
-    results = []
-    for validation in validations:
-        result = validation()
-        results.append(result)
-    
-    print("\n" + "=" * 50)
-    print("📊 VALIDATION SUMMARY")
-    print("=" * 50)
-    
-    if all(results):
-        print("🎉 ALL PWA REQUIREMENTS MET!")
-        print("✅ Your app should be installable")
-        print("📱 PWA install button should appear in browsers")
-        print("\nNext steps:")
-        print("1. Deploy to production (Render)")
-        print("2. Test PWA installation on devices")
-        print("3. Clear browser cache if needed")
+def _is_glob(pattern):
+    return any(char in pattern for char in '*?[')
+
+
+def expand_roots(patterns=(), roots_file=None):
+    """Project roots from paths, globs and a file listing one root per line
+
+    Globs only match directories; blank lines and # comments in the file
+    are skipped (its entries may be globs too). Duplicates are dropped,
+    keeping the first occurrence.
+    """
+    patterns = list(patterns)
+    if roots_file:
+        with open(roots_file, 'r') as f:
+            patterns += [line.strip() for line in f
+                         if line.strip() and not line.lstrip().startswith('#')]
+
+    roots = []
+    for pattern in patterns:
+        if _is_glob(pattern):
+            roots += [path for path in sorted(glob.glob(pattern)) if os.path.isdir(path)]
+        else:
+            roots.append(pattern)
+    return list(dict.fromkeys(os.path.normpath(root) for root in roots))
+
+
+def validate_project(root, checks=CHECKS):
+    """Worker: run `checks` for one project root, one after another"""
+    return run_checks(root, checks, jobs=1)
+
+
+def validate_projects(roots, checks=CHECKS, processes=0):
+    """Validate many project roots; returns [(root, results)] in `roots` order
+
+    processes=0 uses every core and 1 runs in-process. Each worker gets
+    roots in chunks, so the parse_cached entries it builds are reused for
+    every identical manifest, service worker and precached asset it meets.
+    """
+    if processes == 1 or len(roots) < 2:
+        return [(root, validate_project(root, checks)) for root in roots]
+
+    workers = min(processes or os.cpu_count() or 1, len(roots))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(partial(validate_project, checks=checks), roots,
+                           chunksize=max(1, len(roots) // (workers * 4)))
+        return list(zip(roots, results))
+
+
+def print_changes(previous, results):
+    """Print how the re-run checks differ from the last round
+
+    Shows status flips plus the failures that appeared or were fixed.
+    """
+    before = {result.name: result for result in previous}
+    for result in results:
+        if result.cached:
+            continue
+        old = before.get(result.name)
+        old_failures = [text for level, text in old.messages if level == 'fail'] if old else []
+        new_failures = [text for level, text in result.messages if level == 'fail']
+
+        mark = '✅' if result.passed else '❌'
+        status = result.status if old is None or old.status == result.status \
+            else f"{old.status} → {result.status}"
+        print(f"{mark} {result.name}: {status} ({result.elapsed * 1000:.1f} ms)")
+        for text in new_failures:
+            if text not in old_failures:
+                print(f"   ➕ {text}")
+        for text in old_failures:
+            if text not in new_failures:
+                print(f"   ➖ {text}")
+
+
+def watch(root, checks, jobs=None, interval=1.0, cache_path=None, settings=None):
+    """Re-validate whenever an input of a check changes, until interrupted
+
+    Inputs are polled (stat, then hash only if mtime or size moved). Each
+    round reruns just the checks whose inputs changed, prints the pass/fail
+    differences and persists the cache, so a restart skips unchanged checks.
+    """
+    cache = ValidationCache(cache_path or os.path.join(root, '.pwa-validate-cache.json'), settings)
+    results = run_checks(root, checks, jobs, cache)
+    cache.save()
+    sys.stdout.write(format_text(results))
+    print(f"\n👀 Watching {sum(len(cache.entries.get(name, {}).get('inputs', {})) for name, _, _ in checks)} "
+          f"inputs every {interval:g}s (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            stale = [entry for entry in checks if cache.lookup(entry[0]) is None]
+            if not stale:
+                continue
+            previous = results
+            results = run_checks(root, checks, jobs, cache)
+            cache.save()
+            print(f"\n🕒 {time.strftime('%H:%M:%S')}")
+            print_changes(previous, results)
+    except KeyboardInterrupt:
+        print()
+
+    return exit_code(results)
+
+
+def exit_code(results):
+    """0 when every check passed, 1 when any failed, 2 when any could not run"""
+    if any(result.status == ERROR for result in results):
+        return 2
+    if any(result.status == FAIL for result in results):
+        return 1
+    return 0
+
+
+def format_text(results):
+    lines = ["🚀 AEYE Summarizer PWA Validation", "=" * 50]
+
+    for result in results:
+        lines.append("")
+        timing = "cached" if result.cached else f"{result.elapsed * 1000:.1f} ms"
+        lines.append(f"🔍 {result.title}... ({timing})")
+        for level, text in result.messages:
+            lines.append(f"{LEVEL_MARKS[level]} {text}")
+
+    lines += ["", "=" * 50, "📊 VALIDATION SUMMARY", "=" * 50]
+
+    if all(result.passed for result in results):
+        lines += [
+            "🎉 ALL PWA REQUIREMENTS MET!",
+            "✅ Your app should be installable",
+            "📱 PWA install button should appear in browsers",
+            "",
+            "Next steps:",
+            "1. Deploy to production (Render)",
+            "2. Test PWA installation on devices",
+            "3. Clear browser cache if needed",
+        ]
+    else:
+        passed = len([result for result in results if result.passed])
+        lines += [
+            "❌ SOME REQUIREMENTS NOT MET",
+            "⚠️  PWA may not be installable until issues are fixed",
+            f"📊 {passed}/{len(results)} validations passed",
+        ]
+
+    return "\n".join(lines) + "\n"
+
+
+def format_json(results):
+    report = {
+        'passed': all(result.passed for result in results),
+        'exit_code': exit_code(results),
+        'elapsed': round(sum(result.elapsed for result in results), 6),
+        'checks': [result.to_dict() for result in results],
+    }
+    return json.dumps(report, indent=2) + "\n"
+
+
+def _junit_suite(results, suite_name):
+    suite = ET.Element('testsuite', {
+        'name': suite_name,
+        'tests': str(len(results)),
+        'failures': str(len([result for result in results if result.status == FAIL])),
+        'errors': str(len([result for result in results if result.status == ERROR])),
+        'time': f"{sum(result.elapsed for result in results):.6f}",
+    })
+
+    for result in results:
+        case = ET.SubElement(suite, 'testcase', {
+            'classname': suite_name,
+            'name': result.name,
+            'time': f"{result.elapsed:.6f}",
+        })
+        failures = [text for level, text in result.messages if level == 'fail']
+        if result.status != PASS:
+            tag = 'failure' if result.status == FAIL else 'error'
+            ET.SubElement(case, tag, {'message': failures[0] if failures else result.status}).text = \
+                "\n".join(failures)
+        ET.SubElement(case, 'system-out').text = "\n".join(
+            f"[{level}] {text}" for level, text in result.messages)
+    return suite
+
+
+def format_junit(results, suite_name='pwa-validation'):
+    suite = _junit_suite(results, suite_name)
+    ET.indent(suite)
+    return ET.tostring(suite, encoding='unicode', xml_declaration=True) + "\n"
+
+
+FORMATTERS = {'text': format_text, 'json': format_json, 'junit': format_junit}
+
+
+def format_projects_text(projects):
+    lines = [f"🚀 AEYE Summarizer PWA Validation: {len(projects)} projects", "=" * 50]
+    width = max(len(root) for root, _ in projects)
+
+    for root, results in projects:
+        passed = len([result for result in results if result.passed])
+        mark = '✅' if passed == len(results) else '❌'
+        elapsed = sum(result.elapsed for result in results) * 1000
+        lines.append(f"{mark} {root:<{width}}  {passed}/{len(results)} checks passed ({elapsed:.1f} ms)")
+        for result in results:
+            if not result.passed:
+                failures = [text for level, text in result.messages if level == 'fail']
+                lines += [f"   ❌ {result.name}: {text}" for text in failures]
+
+    passed = len([root for root, results in projects if all(result.passed for result in results)])
+    lines += ["", "=" * 50, f"📊 {passed}/{len(projects)} projects passed every check"]
+    return "\n".join(lines) + "\n"
+
+
+def format_projects_json(projects):
+    report = {
+        'passed': all(result.passed for _, results in projects for result in results),
+        'exit_code': exit_code([result for _, results in projects for result in results]),
+        'projects': [{
+            'root': root,
+            'passed': all(result.passed for result in results),
+            'exit_code': exit_code(results),
+            'elapsed': round(sum(result.elapsed for result in results), 6),
+            'checks': [result.to_dict() for result in results],
+        } for root, results in projects],
+    }
+    return json.dumps(report, indent=2) + "\n"
+
+
+def format_projects_junit(projects):
+    suites = ET.Element('testsuites', {'name': 'pwa-validation'})
+    for root, results in projects:
+        suites.append(_junit_suite(results, root))
+    ET.indent(suites)
+    return ET.tostring(suites, encoding='unicode', xml_declaration=True) + "\n"
+
+
+PROJECT_FORMATTERS = {'text': format_projects_text, 'json': format_projects_json,
+                      'junit': format_projects_junit}
+
+
+def parse_bytes(text):
+    """Parse a byte count such as 750000, 500K or 2M"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([kKmM]?)[bB]?\s*', text)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"invalid byte size: {text}")
+    scale = {'': 1, 'k': 1024, 'm': 1024 * 1024}[match.group(2).lower()]
+    return int(float(match.group(1)) * scale)
+
+
+def configure_checks(checks, precache_budget=None):
+    """Bind command line settings to the checks that take them"""
+    if precache_budget is None:
+        return list(checks)
+    return [(name, title, partial(check, precache_budget=precache_budget)
+             if check is validate_service_worker else check)
+            for name, title, check in checks]
+
+
+def main(argv=None):
+    """Run all PWA validations and return the exit code"""
+    parser = argparse.ArgumentParser(description="Validate the PWA setup")
+    parser.add_argument('--format', choices=sorted(FORMATTERS), default='text',
+                        help="report format")
+    parser.add_argument('--output', metavar='PATH',
+                        help="write the report to a file instead of stdout")
+    parser.add_argument('--root', action='append',
+                        help="project directory to validate, or a glob of them; repeatable (default: .)")
+    parser.add_argument('--roots-file', metavar='PATH',
+                        help="file listing project roots (or globs), one per line")
+    parser.add_argument('--processes', type=int, default=0,
+                        help="with several roots, worker processes (0 = all cores)")
+    parser.add_argument('--check', action='append', choices=[name for name, _, _ in CHECKS],
+                        help="run only this check; repeatable")
+    parser.add_argument('--jobs', type=int, default=0,
+                        help="worker threads (0 = one per check)")
+    parser.add_argument('--precache-budget', type=parse_bytes, metavar='BYTES',
+                        help="fail when the gzip-compressed service worker precache exceeds this (e.g. 500K)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and re-validate the checks whose inputs change")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="seconds between polls in --watch mode")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="--watch cache file (default: ROOT/.pwa-validate-cache.json)")
+    args = parser.parse_args(argv)
+    for option, value in (('--jobs', args.jobs), ('--processes', args.processes)):
+        if value < 0:
+            parser.error(f"{option} must be 0 or a positive number of workers, got {value}")
+
+    patterns = args.root or ([] if args.roots_file else ['.'])
+    roots = expand_roots(patterns, args.roots_file)
+    if not roots:
+        parser.error("no project roots matched")
+    several = len(roots) > 1 or args.roots_file or any(_is_glob(pattern) for pattern in patterns)
+    if args.watch and several:
+        parser.error("--watch takes a single --root")
+
+    checks = configure_checks([entry for entry in CHECKS if not args.check or entry[0] in args.check],
+                              args.precache_budget)
+    if args.watch:
+        return watch(roots[0], checks, args.jobs, args.interval, args.cache,
+                     {'precache_budget': args.precache_budget})
+
+    if several:
+        projects = validate_projects(roots, checks, args.processes)
+        results = [result for _, project_results in projects for result in project_results]
+        report = PROJECT_FORMATTERS[args.format](projects)
     else:
-        print("❌ SOME REQUIREMENTS NOT MET")
-        print("⚠️  PWA may not be installable until issues are fixed")
-        failed_count = len([r for r in results if not r])
-        print(f"📊 {len(results) - failed_count}/{len(results)} validations passed")
-    
-    return all(results)
+        results = run_checks(roots[0], checks, args.jobs)
+        report = FORMATTERS[args.format](results)
+
+    if args.output:
+        temp_path = args.output + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(report)
+        os.replace(temp_path, args.output)
+    else:
+        sys.stdout.write(report)
+
+    return exit_code(results)
+
 
 if __name__ == "__main__":
-    success = main()
-    exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(main())